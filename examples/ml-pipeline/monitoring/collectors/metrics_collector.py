@@ -8,15 +8,26 @@ real-time monitoring of model performance and health.
 
 import json
 import logging
+import os
+import random
+import threading
 import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Union, Tuple
 
 import pandas as pd
 import numpy as np
 import requests
 import mlflow
-from prometheus_client import Counter, Gauge, Histogram, push_to_gateway
+from numba import njit, prange
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    push_to_gateway,
+    start_http_server,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +36,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Only one scrape endpoint may be bound per process; it serves the registries
+# of every collector created in the process
+_scrape_registry = CollectorRegistry()
+_metrics_server_started = False
+
+
+@njit(parallel=True, cache=True)
+def _binary_confusion_counts(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[int, int, int, int]:
+    """Count (tp, fp, fn, tn) for binary labels in a single parallel pass."""
+    tp = 0
+    fp = 0
+    fn = 0
+    tn = 0
+    for i in prange(y_true.size):
+        actual = y_true[i] != 0
+        predicted = y_pred[i] != 0
+        if actual and predicted:
+            tp += 1
+        elif predicted:
+            fp += 1
+        elif actual:
+            fn += 1
+        else:
+            tn += 1
+    return tp, fp, fn, tn
+
 
 class ModelMetricsCollector:
     """Collects and logs model performance metrics for monitoring."""
@@ -36,21 +73,43 @@ class ModelMetricsCollector:
         metrics_store: str = "prometheus",
         push_gateway_url: Optional[str] = "localhost:9091",
         mlflow_tracking_uri: Optional[str] = None,
+        feature_schema: Optional[Sequence[str]] = None,
+        min_push_interval: float = 1.0,
+        sample_rate: float = 1.0,
     ):
         """
         Initialize the metrics collector.
         
+        With the prometheus store, long-running processes call ``serve`` to
+        expose the metrics on a ``/metrics`` endpoint for Prometheus to
+        scrape. Short-lived batch jobs that exit before a scrape should call
+        ``push_metrics`` once at the end of the job instead.
+        
         Args:
             model_name: Name of the model to monitor
             model_version: Version of the model
             metrics_store: Type of metrics store (prometheus, mlflow, etc.)
-            push_gateway_url: URL for Prometheus Push Gateway
+            push_gateway_url: URL for Prometheus Push Gateway (batch jobs only)
             mlflow_tracking_uri: URI for MLflow tracking server
+            feature_schema: Ordered feature names, required to log features
+                passed as NumPy arrays or unlabelled sequences
+            min_push_interval: Minimum seconds between Push Gateway pushes;
+                calls inside the interval are coalesced into one trailing push
+            sample_rate: Fraction of predictions whose latency and feature
+                values are recorded in Prometheus; counts are never sampled
         """
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+        
         self.model_name = model_name
         self.model_version = model_version
         self.metrics_store = metrics_store
         self.push_gateway_url = push_gateway_url
+        self.feature_schema = list(feature_schema) if feature_schema is not None else None
+        self.sample_rate = sample_rate
+        
+        # Integer threshold so the per-prediction sampling check avoids floats
+        self._sample_threshold = int(sample_rate * (1 << 30))
         
         # Initialize MLflow if specified
         if mlflow_tracking_uri:
@@ -59,16 +118,30 @@ class ModelMetricsCollector:
         # Initialize Prometheus metrics
         if metrics_store == "prometheus":
             self._init_prometheus_metrics()
+            _scrape_registry.register(self._registry)
+            
+            # Reuse one keep-alive connection for Push Gateway requests
+            if push_gateway_url:
+                self._push_session = requests.Session()
+                self._min_push_interval = min_push_interval
+                self._last_push = float("-inf")
+                self._push_lock = threading.Lock()
+                self._trailing_push: Optional[threading.Timer] = None
             
         logger.info(f"Initialized metrics collector for model: {model_name} v{model_version}")
     
     def _init_prometheus_metrics(self) -> None:
         """Initialize Prometheus metrics."""
+        # Dedicated registry so pushes and scrapes only serialize this model's
+        # metrics, not everything registered on the global default registry
+        self._registry = CollectorRegistry()
+        
         # Create metric objects
         self.prediction_counter = Counter(
             'model_predictions_total',
             'Total number of predictions',
-            ['model_name', 'model_version']
+            ['model_name', 'model_version'],
+            registry=self._registry,
         )
         
         self.prediction_latency = Histogram(
@@ -76,35 +149,177 @@ class ModelMetricsCollector:
             'Latency of model predictions',
             ['model_name', 'model_version'],
             buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0),
+            registry=self._registry,
         )
         
         self.prediction_errors = Counter(
             'model_prediction_errors_total',
             'Total number of prediction errors',
-            ['model_name', 'model_version', 'error_type']
+            ['model_name', 'model_version', 'error_type'],
+            registry=self._registry,
         )
         
         self.feature_value = Gauge(
             'model_feature_value',
             'Feature values used for prediction',
-            ['model_name', 'model_version', 'feature_name']
+            ['model_name', 'model_version', 'feature_name'],
+            registry=self._registry,
         )
         
+        # Pre-bind one child gauge per schema feature so array inputs can be
+        # set positionally without a labels() lookup per value
+        self._feature_gauges = None
+        if self.feature_schema is not None:
+            self._feature_gauges = [
+                self.feature_value.labels(
+                    model_name=self.model_name,
+                    model_version=self.model_version,
+                    feature_name=feature_name
+                )
+                for feature_name in self.feature_schema
+            ]
+        
         self.accuracy_gauge = Gauge(
             'model_accuracy',
             'Model accuracy metric',
-            ['model_name', 'model_version']
+            ['model_name', 'model_version'],
+            registry=self._registry,
         )
         
         self.f1_score_gauge = Gauge(
             'model_f1_score',
             'Model F1 score metric',
-            ['model_name', 'model_version']
+            ['model_name', 'model_version'],
+            registry=self._registry,
         )
     
+    def serve(self, port: Optional[int] = None) -> bool:
+        """
+        Start the Prometheus scrape endpoint, once per process.
+        
+        The endpoint serves the metrics of every collector in the process.
+        
+        Args:
+            port: Port to listen on (defaults to ``METRICS_PORT`` or 9100)
+            
+        Returns:
+            True if the endpoint is running, False if the port was unavailable
+        """
+        global _metrics_server_started
+        if _metrics_server_started:
+            return True
+        
+        port = port or int(os.environ.get("METRICS_PORT", 9100))
+        try:
+            start_http_server(port, registry=_scrape_registry)
+        except OSError as e:
+            logger.error(f"Could not serve Prometheus metrics on port {port}: {e}")
+            return False
+        
+        _metrics_server_started = True
+        logger.info(f"Serving Prometheus metrics on port {port}")
+        return True
+    
+    def _push_handler(
+        self,
+        url: str,
+        method: str,
+        timeout: Optional[float],
+        headers: List[Tuple[str, str]],
+        data: bytes,
+    ):
+        """Push Gateway handler that sends through the collector's session."""
+        def handle() -> None:
+            response = self._push_session.request(
+                method, url, data=data, headers=dict(headers), timeout=timeout
+            )
+            response.raise_for_status()
+        
+        return handle
+    
+    def push_metrics(self, job: Optional[str] = None, force: bool = False) -> None:
+        """
+        Push the current metric values to the Prometheus Push Gateway.
+        
+        Intended for batch jobs that finish before Prometheus can scrape
+        them; long-running servers should rely on the scrape endpoint.
+        Pushes are rate limited to one per ``min_push_interval``; a push
+        skipped inside the interval schedules one trailing push for when it
+        elapses. The trailing push runs on a daemon timer, so call ``close``
+        (or push with ``force``) before the process exits.
+        
+        Args:
+            job: Push Gateway job name (defaults to ``<model>_<version>_batch``)
+            force: Push even if the interval has not elapsed (e.g. at job exit)
+        """
+        if self.metrics_store != "prometheus" or not self.push_gateway_url:
+            logger.warning("No Push Gateway configured; skipping push")
+            return
+        
+        job = job or f"{self.model_name}_{self.model_version}_batch"
+        with self._push_lock:
+            now = time.monotonic()
+            wait = self._last_push + self._min_push_interval - now
+            if not force and wait > 0:
+                if self._trailing_push is None:
+                    self._trailing_push = threading.Timer(wait, self._push_trailing, args=(job,))
+                    self._trailing_push.daemon = True
+                    self._trailing_push.start()
+                return
+            
+            if self._trailing_push is not None:
+                self._trailing_push.cancel()
+                self._trailing_push = None
+            self._last_push = now
+        
+        try:
+            push_to_gateway(
+                self.push_gateway_url,
+                job=job,
+                registry=self._registry,
+                handler=self._push_handler,
+            )
+        except Exception as e:
+            logger.error(f"Failed to push metrics to Prometheus: {e}")
+    
+    def _push_trailing(self, job: str) -> None:
+        """Send the updates coalesced during the last push interval."""
+        with self._push_lock:
+            self._trailing_push = None
+        self.push_metrics(job, force=True)
+    
+    def close(self) -> None:
+        """Flush a pending trailing push to the Push Gateway."""
+        if self.metrics_store != "prometheus" or not self.push_gateway_url:
+            return
+        
+        with self._push_lock:
+            pending = self._trailing_push
+            self._trailing_push = None
+        
+        if pending is not None:
+            pending.cancel()
+            self.push_metrics(pending.args[0], force=True)
+    
+    def _as_feature_dict(
+        self, features: Union[Dict[str, Any], np.ndarray, pd.Series]
+    ) -> Dict[str, Any]:
+        """Convert array-like features to a name -> value dict."""
+        if isinstance(features, dict):
+            return features
+        
+        if isinstance(features, pd.Series) and self.feature_schema is None:
+            return features.to_dict()
+        
+        if self.feature_schema is None:
+            raise ValueError("feature_schema is required to log array features")
+        
+        # Object dtype keeps mixed rows from being coerced to one type
+        return dict(zip(self.feature_schema, np.asarray(features, dtype=object).ravel().tolist()))
+    
     def log_prediction(
         self,
-        features: Dict[str, Any],
+        features: Union[Dict[str, Any], np.ndarray, pd.Series],
         prediction: Any,
         ground_truth: Optional[Any] = None,
         latency: Optional[float] = None,
@@ -114,7 +329,8 @@ class ModelMetricsCollector:
         Log a single prediction event.
         
         Args:
-            features: Input features used for prediction
+            features: Input features used for prediction, either a dict or a
+                NumPy row / pandas Series ordered like ``feature_schema``
             prediction: Model prediction output
             ground_truth: Actual ground truth (if available)
             latency: Prediction latency in seconds
@@ -126,14 +342,16 @@ class ModelMetricsCollector:
         if self.metrics_store == "prometheus":
             self._log_to_prometheus(features, prediction, ground_truth, latency)
         elif self.metrics_store == "mlflow":
+            features = self._as_feature_dict(features)
             self._log_to_mlflow(features, prediction, ground_truth, latency, timestamp, metadata)
         else:
             # Default to JSON logging
+            features = self._as_feature_dict(features)
             self._log_to_json(features, prediction, ground_truth, latency, timestamp, metadata)
     
     def _log_to_prometheus(
         self,
-        features: Dict[str, Any],
+        features: Union[Dict[str, Any], np.ndarray, pd.Series],
         prediction: Any,
         ground_truth: Optional[Any],
         latency: Optional[float],
@@ -145,6 +363,10 @@ class ModelMetricsCollector:
             model_version=self.model_version
         ).inc()
         
+        # Skip the detailed metrics for predictions that are sampled out
+        if self._sample_threshold < (1 << 30) and random.getrandbits(30) >= self._sample_threshold:
+            return
+        
         # Record latency if provided
         if latency is not None:
             self.prediction_latency.labels(
@@ -152,24 +374,26 @@ class ModelMetricsCollector:
                 model_version=self.model_version
             ).observe(latency)
         
-        # Log feature values
-        for feature_name, feature_value in features.items():
+        # Log feature values; numeric arrays take the pre-bound fast path
+        if self._feature_gauges is not None and not isinstance(features, dict):
+            try:
+                values = np.asarray(features, dtype=float).ravel().tolist()
+            except (TypeError, ValueError):
+                # Non-numeric values: skip them one by one below
+                values = None
+            
+            if values is not None:
+                for gauge, feature_value in zip(self._feature_gauges, values):
+                    gauge.set(feature_value)
+                return
+        
+        for feature_name, feature_value in self._as_feature_dict(features).items():
             if isinstance(feature_value, (int, float)):
                 self.feature_value.labels(
                     model_name=self.model_name,
                     model_version=self.model_version,
                     feature_name=feature_name
                 ).set(feature_value)
-        
-        # Push metrics to gateway
-        try:
-            push_to_gateway(
-                self.push_gateway_url,
-                job=f"{self.model_name}_{self.model_version}",
-                registry=None
-            )
-        except Exception as e:
-            logger.error(f"Failed to push metrics to Prometheus: {e}")
     
     def _log_to_mlflow(
         self,
@@ -269,16 +493,6 @@ class ModelMetricsCollector:
                     model_name=self.model_name,
                     model_version=self.model_version
                 ).set(f1_score)
-                
-            # Push metrics to gateway
-            try:
-                push_to_gateway(
-                    self.push_gateway_url,
-                    job=f"{self.model_name}_{self.model_version}_batch",
-                    registry=None
-                )
-            except Exception as e:
-                logger.error(f"Failed to push batch metrics to Prometheus: {e}")
         
         elif self.metrics_store == "mlflow":
             try:
@@ -320,6 +534,47 @@ class ModelMetricsCollector:
             if additional_metrics:
                 for metric_name, metric_value in additional_metrics.items():
                     logger.info(f"  {metric_name}: {metric_value}")
+    
+    def compute_and_log_batch(
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        additional_metrics: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """
+        Compute binary classification metrics from labels and log them.
+        
+        Args:
+            y_true: Ground truth labels (non-zero is the positive class)
+            y_pred: Predicted labels (non-zero is the positive class)
+            additional_metrics: Any additional metrics to log
+            
+        Returns:
+            Dictionary with accuracy, precision, recall and f1_score
+        """
+        y_true = np.ascontiguousarray(y_true).ravel()
+        y_pred = np.ascontiguousarray(y_pred).ravel()
+        if y_true.size != y_pred.size:
+            raise ValueError("y_true and y_pred must have the same length")
+        if y_true.size == 0:
+            raise ValueError("Cannot compute metrics on empty arrays")
+        
+        tp, fp, fn, tn = _binary_confusion_counts(y_true, y_pred)
+        
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        metrics = {
+            "accuracy": (tp + tn) / y_true.size,
+            "precision": precision,
+            "recall": recall,
+            "f1_score": (
+                2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            ),
+        }
+        
+        self.log_batch_metrics(**metrics, additional_metrics=additional_metrics)
+        
+        return metrics
 
 if __name__ == "__main__":
     # Example usage
@@ -7,9 +7,11 @@ to model deployment and monitoring.
 
 import os
 from datetime import datetime, timedelta
+from typing import Any, Dict
 
+import pyarrow.feather as feather
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.decorators import task
 from airflow.operators.bash import BashOperator
 from airflow.sensors.external_task import ExternalTaskSensor
 from airflow.sensors.filesystem import FileSensor
@@ -61,7 +63,8 @@ data_validation_sensor = FileSensor(
     dag=dag,
 )
 
-def _ingest_data(**context):
+@task(task_id="ingest_data", dag=dag)
+def ingest_data(ts_nodash: str = None) -> str:
     """Task to ingest data from various sources."""
     from ml_pipeline.data.ingest import DataIngestion
     
@@ -75,61 +78,39 @@ def _ingest_data(**context):
     ingestion.ingest_from_file(f"{DATA_PATH}/raw_data.csv")
     ingestion.ingest_from_database("production_db", "customer_data")
     
-    # Save ingested data
-    output_file = ingestion.save(f"{DATA_PATH}/processed/data_{context['ts_nodash']}.parquet")
-    
-    # Log output path for downstream tasks
-    context["ti"].xcom_push(key="processed_data_path", value=output_file)
+    # Save ingested data as uncompressed Arrow IPC (Feather v2) so downstream
+    # tasks can memory-map it zero-copy instead of decoding parquet again;
+    # compressed buffers would have to be decompressed into memory
+    output_file = f"{DATA_PATH}/processed/data_{ts_nodash}.arrow"
+    feather.write_feather(ingestion.to_pandas(), output_file, compression="uncompressed")
     
     return output_file
 
-ingest_data = PythonOperator(
-    task_id="ingest_data",
-    python_callable=_ingest_data,
-    provide_context=True,
-    dag=dag,
-)
-
-def _feature_engineering(**context):
+@task(task_id="feature_engineering", dag=dag)
+def feature_engineering(processed_data_path: str) -> str:
     """Task to perform feature engineering."""
     from ml_pipeline.features.transformers import FeatureEngineer
     
-    # Get processed data path from upstream task
-    processed_data_path = context["ti"].xcom_pull(
-        task_ids="ingest_data", key="processed_data_path"
+    # Memory-map the Arrow file; columns are read without a decode pass
+    processed_data = feather.read_table(processed_data_path, memory_map=True).to_pandas(
+        zero_copy_only=False
     )
     
     # Initialize feature engineering
     feature_engineer = FeatureEngineer(
-        input_path=processed_data_path,
+        input_data=processed_data,
         output_path=f"{DATA_PATH}/features",
         config_path="config/feature_config.yml",
     )
     
     # Generate features
-    output_file = feature_engineer.generate_features()
-    
-    # Log output path for downstream tasks
-    context["ti"].xcom_push(key="features_path", value=output_file)
-    
-    return output_file
-
-feature_engineering = PythonOperator(
-    task_id="feature_engineering",
-    python_callable=_feature_engineering,
-    provide_context=True,
-    dag=dag,
-)
+    return feature_engineer.generate_features()
 
-def _train_model(**context):
+@task(task_id="train_model", multiple_outputs=True, dag=dag)
+def train_model(features_path: str) -> Dict[str, str]:
     """Task to train the model."""
     from ml_pipeline.training.trainers import ModelTrainer
     
-    # Get features path from upstream task
-    features_path = context["ti"].xcom_pull(
-        task_ids="feature_engineering", key="features_path"
-    )
-    
     # Initialize model trainer
     trainer = ModelTrainer(
         data_path=features_path,
@@ -142,31 +123,13 @@ def _train_model(**context):
     # Train model
     run_id, model_uri = trainer.train()
     
-    # Log model info for downstream tasks
-    context["ti"].xcom_push(key="run_id", value=run_id)
-    context["ti"].xcom_push(key="model_uri", value=model_uri)
-    
-    return run_id
+    return {"run_id": run_id, "model_uri": model_uri}
 
-train_model = PythonOperator(
-    task_id="train_model",
-    python_callable=_train_model,
-    provide_context=True,
-    dag=dag,
-)
-
-def _evaluate_model(**context):
+@task(task_id="evaluate_model", multiple_outputs=True, dag=dag)
+def evaluate_model(run_id: str, features_path: str, ts_nodash: str = None) -> Dict[str, Any]:
     """Task to evaluate the model."""
     from ml_pipeline.training.evaluation import ModelEvaluator
     
-    # Get model info from upstream task
-    run_id = context["ti"].xcom_pull(task_ids="train_model", key="run_id")
-    
-    # Get features path from upstream task
-    features_path = context["ti"].xcom_pull(
-        task_ids="feature_engineering", key="features_path"
-    )
-    
     # Initialize model evaluator
     evaluator = ModelEvaluator(
         data_path=features_path,
@@ -180,34 +143,22 @@ def _evaluate_model(**context):
     
     # Check if accuracy meets threshold for deployment
     should_deploy = metrics.get("accuracy", 0) >= 0.8
-    context["ti"].xcom_push(key="should_deploy", value=should_deploy)
-    context["ti"].xcom_push(key="metrics", value=metrics)
     
     # Generate evaluation report
     report_path = evaluator.generate_report(
-        output_path=f"{DATA_PATH}/reports/evaluation_{context['ts_nodash']}.html"
+        output_path=f"{DATA_PATH}/reports/evaluation_{ts_nodash}.html"
     )
-    context["ti"].xcom_push(key="report_path", value=report_path)
     
-    return should_deploy
+    return {"should_deploy": should_deploy, "metrics": metrics, "report_path": report_path}
 
-evaluate_model = PythonOperator(
-    task_id="evaluate_model",
-    python_callable=_evaluate_model,
-    provide_context=True,
-    dag=dag,
-)
-
-def _deploy_model(**context):
+@task(task_id="deploy_model", dag=dag)
+def deploy_model(
+    run_id: str, metrics: Dict[str, Any], should_deploy: bool, ts: str = None
+) -> bool:
     """Task to deploy the model to production."""
     from ml_pipeline.deployment import ModelDeployer
     
-    # Get model info from upstream tasks
-    run_id = context["ti"].xcom_pull(task_ids="train_model", key="run_id")
-    metrics = context["ti"].xcom_pull(task_ids="evaluate_model", key="metrics")
-    
     # Check if we should deploy
-    should_deploy = context["ti"].xcom_pull(task_ids="evaluate_model", key="should_deploy")
     if not should_deploy:
         raise ValueError(f"Model metrics do not meet deployment threshold: {metrics}")
     
@@ -223,7 +174,7 @@ def _deploy_model(**context):
         run_id=run_id,
         model_name=MODEL_NAME,
         model_version=MODEL_VERSION,
-        description=f"Model trained on {context['ts']}",
+        description=f"Model trained on {ts}",
         metrics=metrics,
     )
     
@@ -237,36 +188,19 @@ def _deploy_model(**context):
         raise ValueError("Model validation failed")
     
     # Deploy model
-    deployed = deployer.deploy_model(
+    return deployer.deploy_model(
         model_name=MODEL_NAME,
         set_as_default=True,
         restart_server=True,
     )
-    
-    context["ti"].xcom_push(key="deployment_success", value=deployed)
-    return deployed
-
-deploy_model = PythonOperator(
-    task_id="deploy_model",
-    python_callable=_deploy_model,
-    provide_context=True,
-    dag=dag,
-)
 
 # Configure monitoring
-def _setup_monitoring(**context):
+@task(task_id="setup_monitoring", dag=dag)
+def setup_monitoring(run_id: str, features_path: str) -> bool:
     """Task to setup monitoring for the deployed model."""
     from ml_pipeline.monitoring.collectors.metrics_collector import ModelMetricsCollector
     from ml_pipeline.monitoring.collectors.drift_detector import DriftDetector
     
-    # Get model info from upstream tasks
-    run_id = context["ti"].xcom_pull(task_ids="train_model", key="run_id")
-    
-    # Get features path from upstream task
-    features_path = context["ti"].xcom_pull(
-        task_ids="feature_engineering", key="features_path"
-    )
-    
     # Setup metrics collector
     metrics_collector = ModelMetricsCollector(
         model_name=MODEL_NAME,
@@ -287,13 +221,6 @@ def _setup_monitoring(**context):
     
     return True
 
-setup_monitoring = PythonOperator(
-    task_id="setup_monitoring",
-    python_callable=_setup_monitoring,
-    provide_context=True,
-    dag=dag,
-)
-
 # Notification task
 deployment_notification = SlackWebhookOperator(
     task_id="deployment_notification",
@@ -305,22 +232,27 @@ deployment_notification = SlackWebhookOperator(
         *Environment:* {{ var.value.deployment_env }}
         *Accuracy:* {{ ti.xcom_pull(task_ids='evaluate_model', key='metrics').get('accuracy', 'N/A') }}
         *F1 Score:* {{ ti.xcom_pull(task_ids='evaluate_model', key='metrics').get('f1_score', 'N/A') }}
-        *Deployed:* {{ ti.xcom_pull(task_ids='deploy_model', key='deployment_success') }}
+        *Deployed:* {{ ti.xcom_pull(task_ids='deploy_model') }}
         *Date:* {{ ds }}
     """,
     trigger_rule=TriggerRule.ALL_DONE,  # Send notification regardless of upstream task status
     dag=dag,
 )
 
-# Define task dependencies
-data_validation_sensor >> ingest_data
-ingest_data >> feature_engineering
-feature_engineering >> train_model
-train_model >> evaluate_model
-evaluate_model >> deploy_model
-deploy_model >> setup_monitoring
-deploy_model >> deployment_notification
-setup_monitoring >> deployment_notification
+# Define task dependencies; data dependencies are wired through return values
+processed_data_path = ingest_data()
+features_path = feature_engineering(processed_data_path)
+training = train_model(features_path)
+evaluation = evaluate_model(training["run_id"], features_path)
+deployed = deploy_model(
+    training["run_id"], evaluation["metrics"], evaluation["should_deploy"]
+)
+monitoring = setup_monitoring(training["run_id"], features_path)
+
+data_validation_sensor >> processed_data_path
+deployed >> monitoring
+deployed >> deployment_notification
+monitoring >> deployment_notification
 
 if __name__ == "__main__":
     dag.cli() 
\ No newline at end of file
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Serving Kernels Build
+
+This module compiles the numeric helpers used on the model serving hot path
+ahead of time into the ``ml_kernels`` extension module, so API workers do not
+pay numba's JIT compile cost on their first request. Run it once at image
+build time:
+
+    python api/build_kernels.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+cc = CC("ml_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@cc.export("pack_f32", "void(f4[:,:], f4[:,:])")
+def pack_columns(columns, out):
+    """Scatter feature-major column buffers into a row-major matrix."""
+    for i in range(out.shape[0]):
+        for j in range(out.shape[1]):
+            out[i, j] = columns[j, i]
+
+
+if __name__ == "__main__":
+    cc.compile()
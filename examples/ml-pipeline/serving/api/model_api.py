@@ -7,21 +7,38 @@ This module provides a FastAPI application for serving machine learning models.
 import os
 import sys
 import json
+import asyncio
+import fcntl
+import functools
 import logging
-import pickle
+import queue
+import re
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from hashlib import blake2b
+from typing import Annotated, Callable, Dict, List, Any, NamedTuple, Optional, Tuple, Union
 
+import joblib
 import numpy as np
 import pandas as pd
 import mlflow
 import mlflow.pyfunc
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+import msgspec
+import orjson
+import pyarrow as pa
+from cachetools import LRUCache
+from numba import njit
+from fastapi import FastAPI, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, validator
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 import uvicorn
-from prometheus_client import Counter, Histogram, start_http_server
+from prometheus_client import CollectorRegistry, Counter, Histogram, make_asgi_app, multiprocess
 
 # Configure path to access feature transformer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -41,6 +58,42 @@ PREDICTION_LATENCY = Histogram(
 )
 FEATURE_COUNT = Counter("feature_count", "Number of features used for prediction", ["model"])
 
+
+class ModelMetrics(NamedTuple):
+    """Metric children pre-bound to one model's labels."""
+    
+    success: Any
+    errors: Any
+    latency: Any
+    features: Any
+
+
+def bind_model_metrics(model_name: str) -> ModelMetrics:
+    """Resolve the per-model metric labels once, off the request path."""
+    return ModelMetrics(
+        success=PREDICTION_COUNT.labels(model=model_name, status="success"),
+        errors=PREDICTION_COUNT.labels(model=model_name, status="error"),
+        latency=PREDICTION_LATENCY.labels(model=model_name),
+        features=FEATURE_COUNT.labels(model=model_name),
+    )
+
+# Micro-batching settings
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 64))
+MAX_WAIT_MS = float(os.environ.get("MAX_WAIT_MS", 5))
+
+# Streaming settings for clients that accept ND-JSON responses
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", 1024))
+
+# Directory for memory-mappable model dumps shared by all worker processes
+SHARED_MODEL_DIR = os.environ.get(
+    "SHARED_MODEL_DIR", os.path.join(tempfile.gettempdir(), "model_api_shared")
+)
+
+# Prediction cache settings
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", 100_000))
+
 # Create FastAPI app
 app = FastAPI(
     title="ML Model API",
@@ -77,6 +130,8 @@ class ModelConfig:
         self.default_model = config.get("default_model")
         self.feature_transformer_path = config.get("feature_transformer_path")
         self.mlflow_tracking_uri = config.get("mlflow_tracking_uri")
+        self.api = config.get("api", {})
+        self.monitoring = config.get("monitoring", {})
         
         # Set MLflow tracking URI if provided
         if self.mlflow_tracking_uri:
@@ -97,11 +152,57 @@ except Exception as e:
     config.default_model = None
     config.feature_transformer_path = None
     config.mlflow_tracking_uri = None
+    config.api = {}
+    config.monitoring = {}
+
+# Server processes, each with an equal share of the CPUs for its inference
+# threads so BLAS and the GIL are not oversubscribed across workers
+API_WORKERS = int(os.environ.get("UVICORN_WORKERS", config.api.get("max_workers", os.cpu_count())))
+
+# Threads for CPU-bound transform/predict work, kept off the event loop
+INFERENCE_POOL = ThreadPoolExecutor(
+    max_workers=int(
+        os.environ.get("INFERENCE_THREADS", max(1, (os.cpu_count() or 1) // API_WORKERS))
+    ),
+    thread_name_prefix="inference",
+)
+
+# Serve Prometheus metrics from the API itself; under multiple workers
+# (PROMETHEUS_MULTIPROC_DIR set) aggregate every worker's samples per scrape
+METRICS_PATH = config.monitoring.get("metrics_path", "/metrics")
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    # The collector and the per-model metric bindings below need the
+    # directory to exist at import time
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+    metrics_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(metrics_registry)
+    app.mount(METRICS_PATH, make_asgi_app(registry=metrics_registry))
+else:
+    app.mount(METRICS_PATH, make_asgi_app())
 
 
 # Load models and transformers
 loaded_models = {}
-feature_transformer = None
+
+# Per-model locks so concurrent first requests load each model only once
+_model_load_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_model_async_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Predictions for previously seen feature rows, keyed by (model, feature hash)
+prediction_cache = LRUCache(maxsize=PREDICTION_CACHE_SIZE)
+_CACHE_MISS = object()
+
+# Declared input feature order per model, used to pack requests into arrays
+model_features = {
+    name: model_config.get("features", []) for name, model_config in config.models.items()
+}
+model_metrics = {name: bind_model_metrics(name) for name in config.models}
+model_needs_frame = {
+    name: model_config.get("type", "mlflow") == "mlflow"
+    for name, model_config in config.models.items()
+}
+# Width of the matrix each model receives, recorded on its first prediction
+model_n_features: Dict[str, int] = {}
 
 
 def load_model(model_name: str) -> Any:
@@ -126,66 +227,146 @@ def load_model(model_name: str) -> Any:
             detail=f"Model '{model_name}' not found in configuration"
         )
     
-    model_config = config.models[model_name]
-    model_type = model_config.get("type", "mlflow")
-    
-    try:
-        if model_type == "mlflow":
-            # Load from MLflow
-            run_id = model_config.get("run_id")
-            if not run_id:
-                raise ValueError("run_id is required for MLflow models")
+    with _model_load_locks[model_name]:
+        # Another thread may have finished loading while we waited
+        if model_name in loaded_models:
+            return loaded_models[model_name]
+        
+        model_config = config.models[model_name]
+        model_type = model_config.get("type", "mlflow")
+        
+        try:
+            if model_type == "mlflow":
+                # Load from MLflow
+                run_id = model_config.get("run_id")
+                if not run_id:
+                    raise ValueError("run_id is required for MLflow models")
+                
+                model_uri = f"runs:/{run_id}/model"
+                model = mlflow.pyfunc.load_model(model_uri)
             
-            model_uri = f"runs:/{run_id}/model"
-            model = mlflow.pyfunc.load_model(model_uri)
-        
-        elif model_type == "pickle":
-            # Load from pickle file
-            model_path = model_config.get("path")
-            if not model_path:
-                raise ValueError("path is required for pickle models")
+            elif model_type in ("pickle", "joblib"):
+                # Load from pickle/joblib file via a shared memory-mapped dump
+                model_path = model_config.get("path")
+                if not model_path:
+                    raise ValueError(f"path is required for {model_type} models")
+                
+                model = _load_shared_model(model_name, model_path)
             
-            with open(model_path, "rb") as f:
-                model = pickle.load(f)
-        
-        else:
-            raise ValueError(f"Unsupported model type: {model_type}")
+            else:
+                raise ValueError(f"Unsupported model type: {model_type}")
+            
+            # Store for future use
+            loaded_models[model_name] = model
+            logger.info(f"Loaded model '{model_name}'")
+            
+            return model
         
-        # Store for future use
-        loaded_models[model_name] = model
-        logger.info(f"Loaded model '{model_name}'")
+        except Exception as e:
+            logger.error(f"Error loading model '{model_name}': {e}")
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Error loading model: {str(e)}"
+            )
+
+
+def _load_shared_model(model_name: str, model_path: str) -> Any:
+    """
+    Load a file-based model with its arrays shared across worker processes.
+    
+    The first worker to get here re-dumps the model uncompressed with joblib
+    into SHARED_MODEL_DIR while holding an exclusive file lock; every worker
+    then memory-maps that dump read-only, so the numpy arrays of the fitted
+    estimator are backed by the same page-cache pages rather than one heap
+    copy per worker. Dumps are keyed by the source file's mtime, so
+    replacing the model file produces a fresh dump and deletes the old ones;
+    workers that still map an old dump keep it until they unmap it.
+    
+    Args:
+        model_name: Name of the model
+        model_path: Path to the pickle/joblib model file
         
-        return model
+    Returns:
+        Loaded model
+    """
+    os.makedirs(SHARED_MODEL_DIR, exist_ok=True)
+    mtime_ns = os.stat(model_path).st_mtime_ns
+    shared_path = os.path.join(SHARED_MODEL_DIR, f"{model_name}-{mtime_ns}.joblib")
     
-    except Exception as e:
-        logger.error(f"Error loading model '{model_name}': {e}")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Error loading model: {str(e)}"
-        )
+    with open(f"{shared_path}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if not os.path.exists(shared_path):
+            tmp_path = f"{shared_path}.tmp"
+            joblib.dump(joblib.load(model_path), tmp_path)
+            os.replace(tmp_path, shared_path)
+            logger.info(f"Created shared model dump for '{model_name}' at {shared_path}")
+            
+            # Remove dumps of earlier versions of the model file
+            superseded = re.compile(rf"{re.escape(model_name)}-\d+\.joblib(\.lock)?")
+            current = {os.path.basename(shared_path), os.path.basename(lock_file.name)}
+            for file_name in os.listdir(SHARED_MODEL_DIR):
+                if superseded.fullmatch(file_name) and file_name not in current:
+                    try:
+                        os.remove(os.path.join(SHARED_MODEL_DIR, file_name))
+                    except FileNotFoundError:
+                        pass
+    
+    return joblib.load(shared_path, mmap_mode="r")
 
 
-def get_feature_transformer() -> Optional[FeatureTransformer]:
+async def aload_model(model_name: str) -> Any:
     """
-    Get the feature transformer.
+    Load a model by name without blocking the event loop.
     
+    Concurrent callers for the same model wait on one load instead of
+    each starting their own.
+    
+    Args:
+        model_name: Name of the model to load
+        
     Returns:
-        Feature transformer instance or None if not configured
+        Loaded model
     """
-    global feature_transformer
+    if model_name in loaded_models:
+        return loaded_models[model_name]
     
-    if feature_transformer is not None:
-        return feature_transformer
+    async with _model_async_locks[model_name]:
+        if model_name in loaded_models:
+            return loaded_models[model_name]
+        return await asyncio.get_running_loop().run_in_executor(None, load_model, model_name)
+
+
+@functools.lru_cache(maxsize=1)
+def get_feature_transform() -> Optional[Callable[[Any], Any]]:
+    """
+    Get the feature transformer's bound ``transform`` method.
     
-    if config.feature_transformer_path:
-        try:
-            feature_transformer = FeatureTransformer.load(config.feature_transformer_path)
-            logger.info(f"Loaded feature transformer from {config.feature_transformer_path}")
-            return feature_transformer
-        except Exception as e:
-            logger.error(f"Error loading feature transformer: {e}")
+    The transformer is loaded on the first call and the result is cached, so
+    the prediction path pays neither a reload nor a global lookup and
+    ``None`` check per request. Failures are not cached: a transformer that
+    fails to load raises, and the next call tries again, so predictions are
+    never made on untransformed features.
     
-    return None
+    Returns:
+        Bound transform method or None if no transformer is configured
+        
+    Raises:
+        HTTPException: If a transformer is configured but cannot be loaded
+    """
+    if not config.feature_transformer_path:
+        return None
+    
+    try:
+        feature_transformer = FeatureTransformer.load(config.feature_transformer_path)
+    except Exception as e:
+        logger.error(f"Error loading feature transformer: {e}")
+        raise HTTPException(
+            status_code=503, 
+            detail=f"Error loading feature transformer: {str(e)}"
+        )
+    
+    logger.info(f"Loaded feature transformer from {config.feature_transformer_path}")
+    return feature_transformer.transform
 
 
 def get_default_model() -> Any:
@@ -207,24 +388,367 @@ def get_default_model() -> Any:
     return load_model(config.default_model)
 
 
-# Pydantic models for API
-class PredictionFeatures(BaseModel):
+def _cache_key(model_name: str, features: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Build a stable cache key from a model name and a feature row."""
+    digest = blake2b(orjson.dumps(features, option=orjson.OPT_SORT_KEYS), digest_size=16)
+    return model_name, digest.digest()
+
+
+def _validate_features(model_name: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    Check that every row provides the model's declared features as numbers.
+    
+    Rows are checked before they are queued, so a bad request is rejected
+    on its own instead of failing the micro-batch it would have joined.
+    
+    Raises:
+        HTTPException: If a declared feature is missing or not numeric
+    """
+    feature_names = model_features.get(model_name)
+    if not feature_names:
+        return
+    
+    for i, features in enumerate(rows):
+        missing = [name for name in feature_names if name not in features]
+        if missing:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Instance {i} is missing features: {', '.join(missing)}"
+            )
+        
+        invalid = [
+            name for name in feature_names
+            if not isinstance(features[name], (int, float))
+        ]
+        if invalid:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Instance {i} has non-numeric features: {', '.join(invalid)}"
+            )
+
+
+# Numeric kernels are compiled ahead of time by build_kernels.py; fall back to
+# JIT compilation (paid on first use) when the extension has not been built
+try:
+    from ml_kernels import pack_f32 as _pack_columns
+except ImportError:
+    from build_kernels import pack_columns
+    
+    logger.warning("ml_kernels extension not built; JIT-compiling serving kernels")
+    _pack_columns = njit(cache=True)(pack_columns)
+
+
+# Reusable per-thread input buffers, keyed by (model, buffer kind)
+_thread_buffers = threading.local()
+
+
+def _thread_buffer(
+    model_name: str, kind: str, n_rows: int, n_features: int, order: str = "C"
+) -> np.ndarray:
+    """
+    Return an (n_rows, n_features) float32 view of this thread's buffer for a model.
+    
+    The buffer grows to fit the largest batch seen and is never shared
+    between threads, so inference threads can fill it without locking.
+    """
+    buffers = getattr(_thread_buffers, "buffers", None)
+    if buffers is None:
+        buffers = _thread_buffers.buffers = {}
+    
+    key = (model_name, kind)
+    buffer = buffers.get(key)
+    if buffer is None or buffer.shape[0] < n_rows:
+        # Size for a full micro-batch up front to avoid regrowth
+        buffer = np.empty(
+            (max(n_rows, MAX_BATCH_SIZE), n_features), dtype=np.float32, order=order
+        )
+        buffers[key] = buffer
+    
+    return buffer[:n_rows]
+
+
+def _pack_features(
+    model_name: str, rows: List[Dict[str, Any]]
+) -> Union[np.ndarray, pd.DataFrame]:
+    """
+    Pack feature rows into a matrix in the model's declared feature order.
+    
+    Models that declare their features are filled into this thread's
+    preallocated float32 buffer; others fall back to letting pandas infer
+    columns from the dictionaries.
+    """
+    feature_names = model_features.get(model_name)
+    if not feature_names:
+        return pd.DataFrame(rows)
+    
+    # Dictionary lookups stay in Python, one vectorized pass per feature;
+    # the element-wise packing loop runs compiled
+    n_rows = len(rows)
+    n_features = len(feature_names)
+    columns = _thread_buffer(model_name, "columns", n_rows, n_features, order="F").T
+    for j, name in enumerate(feature_names):
+        columns[j] = np.fromiter(
+            (features[name] for features in rows), dtype=np.float32, count=n_rows
+        )
+    
+    X = _thread_buffer(model_name, "input", n_rows, n_features)
+    _pack_columns(columns, X)
+    
+    return X
+
+
+def _predict_matrix(
+    model_name: str, input_data: Union[np.ndarray, pd.DataFrame]
+) -> Tuple[np.ndarray, int]:
+    """
+    Run the feature transformer and model on a packed input matrix.
+    
+    Args:
+        model_name: Name of the model to use
+        input_data: Input features, one row per instance
+        
+    Returns:
+        Tuple of (predictions, number of features passed to the model)
+        
+    Raises:
+        HTTPException: If the transformer or model fails
+    """
+    model = load_model(model_name)
+    transform = get_feature_transform()
+    
+    # Apply feature transformer if available
+    if transform is not None:
+        try:
+            input_data = transform(input_data)
+        except Exception as e:
+            logger.error(f"Error applying feature transformer: {e}")
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Error applying feature transformer: {str(e)}"
+            )
+    
+    # Make predictions
+    try:
+        predictions = np.asarray(model.predict(input_data))
+    except Exception as e:
+        logger.error(f"Error making predictions: {e}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error making predictions: {str(e)}"
+        )
+    
+    n_features = model_n_features.get(model_name)
+    if n_features is None:
+        n_features = model_n_features[model_name] = input_data.shape[1]
+    
+    return predictions, n_features
+
+
+def _predict_batch(model_name: str, rows: List[Dict[str, Any]]) -> Tuple[np.ndarray, int]:
+    """
+    Pack a batch of feature rows and run them through the model.
+    
+    Args:
+        model_name: Name of the model to use
+        rows: Feature dictionaries, one per instance
+        
+    Returns:
+        Tuple of (predictions, number of features passed to the model)
+        
+    Raises:
+        HTTPException: If the transformer or model fails
+    """
+    input_data = _pack_features(model_name, rows)
+    
+    # Only wrap the array (without copying) when something needs column
+    # names: the feature transformer or an MLflow pyfunc model's schema
+    if isinstance(input_data, np.ndarray) and (
+        get_feature_transform() is not None or model_needs_frame[model_name]
+    ):
+        input_data = pd.DataFrame(input_data, columns=model_features[model_name], copy=False)
+    
+    return _predict_matrix(model_name, input_data)
+
+
+class BatchScheduler:
+    """Coalesces concurrent prediction requests into batched model calls."""
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            max_batch_size: Maximum number of rows per model call
+            max_wait_ms: Maximum time to wait for more requests before predicting
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+    
+    def start(self, model_names: List[str]) -> None:
+        """
+        Start one batching worker per model.
+        
+        Args:
+            model_names: Names of the models to serve
+        """
+        for model_name in model_names:
+            if model_name in self._workers:
+                continue
+            queue = asyncio.Queue()
+            self._queues[model_name] = queue
+            self._workers[model_name] = asyncio.create_task(self._run(model_name, queue))
+    
+    async def stop(self) -> None:
+        """Cancel all batching workers."""
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+    
+    async def submit(
+        self, model_name: str, rows: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Queue rows for prediction and wait for the batched result.
+        
+        Args:
+            model_name: Name of the model to use
+            rows: Feature dictionaries, one per instance
+            
+        Returns:
+            Tuple of (predictions for these rows, number of model features)
+        """
+        if model_name not in self._queues:
+            self.start([model_name])
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queues[model_name].put((rows, future))
+        return await future
+    
+    async def _run(self, model_name: str, queue: asyncio.Queue) -> None:
+        """Collect queued requests into batches and predict them together."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            items = [await queue.get()]
+            n_rows = len(items[0][0])
+            
+            # Keep collecting until the batch is full or the window closes
+            deadline = loop.time() + self.max_wait
+            while n_rows < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n_rows += len(item[0])
+            
+            rows = [row for item_rows, _ in items for row in item_rows]
+            try:
+                predictions, n_features = await loop.run_in_executor(
+                    INFERENCE_POOL, _predict_batch, model_name, rows
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            # Hand each request back its slice of the batch
+            offset = 0
+            for item_rows, future in items:
+                end = offset + len(item_rows)
+                if not future.done():
+                    future.set_result((predictions[offset:end], n_features))
+                offset = end
+
+
+batch_scheduler = BatchScheduler()
+
+
+# Request models, decoded with msgspec rather than validated by pydantic
+class PredictionFeatures(msgspec.Struct):
     """Model for prediction feature data."""
     
-    features: Dict[str, Any] = Field(..., description="Feature values as key-value pairs")
+    features: Annotated[
+        Dict[str, Any], msgspec.Meta(description="Feature values as key-value pairs")
+    ]
 
 
-class PredictionRequest(BaseModel):
+class PredictionRequest(msgspec.Struct):
     """Model for prediction request."""
     
-    data: List[PredictionFeatures] = Field(..., description="List of instances to predict")
-    model: Optional[str] = Field(None, description="Model to use for prediction")
+    data: Annotated[
+        List[PredictionFeatures], msgspec.Meta(description="List of instances to predict")
+    ]
+    model: Annotated[
+        Optional[str], msgspec.Meta(description="Model to use for prediction")
+    ] = None
+
+
+_prediction_request_decoder = msgspec.json.Decoder(PredictionRequest)
+
+# JSON schemas for msgspec request models, merged into the OpenAPI document
+(_prediction_request_schema,), _request_schema_components = msgspec.json.schema_components(
+    [PredictionRequest], ref_template="#/components/schemas/{name}"
+)
+PREDICTION_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _prediction_request_schema}},
+    }
+}
+
+
+def custom_openapi() -> Dict[str, Any]:
+    """Build the OpenAPI schema, including the msgspec request models."""
+    if app.openapi_schema:
+        return app.openapi_schema
+    
+    schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+    )
+    schema.setdefault("components", {}).setdefault("schemas", {}).update(
+        _request_schema_components
+    )
+    app.openapi_schema = schema
+    return schema
+
+
+app.openapi = custom_openapi
+
+
+async def decode_prediction_request(raw_request: Request) -> PredictionRequest:
+    """
+    Decode and validate a prediction request body.
+    
+    Args:
+        raw_request: Incoming HTTP request
+        
+    Returns:
+        Decoded prediction request
+        
+    Raises:
+        HTTPException: If the body is malformed or has no instances
+    """
+    try:
+        request = _prediction_request_decoder.decode(await raw_request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    if not request.data:
+        raise HTTPException(status_code=422, detail="data cannot be empty")
     
-    @validator("data")
-    def validate_data_not_empty(cls, v):
-        if not v:
-            raise ValueError("data cannot be empty")
-        return v
+    return request
 
 
 class PredictionResponse(BaseModel):
@@ -285,22 +809,30 @@ async def get_model_info(model_name: str):
     }
 
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(
-    request: PredictionRequest,
-    background_tasks: BackgroundTasks,
-):
+@app.post(
+    "/predict",
+    response_class=ORJSONResponse,
+    responses={200: {"model": PredictionResponse}},
+    openapi_extra=PREDICTION_REQUEST_BODY,
+)
+async def predict(raw_request: Request):
     """
     Make predictions using a model.
     
     Args:
-        request: Prediction request
-        background_tasks: FastAPI background tasks
+        raw_request: HTTP request carrying a JSON prediction request
         
     Returns:
         Prediction response
     """
-    start_time = datetime.now()
+    start_ns = time.perf_counter_ns()
+    timestamp = datetime.now().isoformat()
+    
+    # Columnar clients send Arrow IPC instead of JSON
+    if raw_request.headers.get("content-type", "").startswith(ARROW_STREAM_MEDIA_TYPE):
+        return await _predict_arrow(raw_request, start_ns, timestamp)
+    
+    request = await decode_prediction_request(raw_request)
     model_name = request.model or config.default_model
     
     if not model_name:
@@ -310,57 +842,175 @@ async def predict(
         )
     
     try:
-        # Load model
-        model = load_model(model_name)
+        # Fail fast on unknown models before queueing
+        await aload_model(model_name)
         
         # Process input data
-        data = []
-        for item in request.data:
-            data.append(item.features)
+        rows = [item.features for item in request.data]
+        _validate_features(model_name, rows)
+        
+        # Large batches can be streamed back chunk by chunk as ND-JSON
+        if NDJSON_MEDIA_TYPE in raw_request.headers.get("accept", ""):
+            return StreamingResponse(
+                _stream_predictions(model_name, rows, start_ns, timestamp),
+                media_type=NDJSON_MEDIA_TYPE,
+            )
         
-        # Convert to DataFrame
-        input_df = pd.DataFrame(data)
+        # Serve repeated feature rows from the cache; only misses reach the model
+        keys = [_cache_key(model_name, features) for features in rows]
+        cached = [prediction_cache.get(key, _CACHE_MISS) for key in keys]
+        misses = [i for i, prediction in enumerate(cached) if prediction is _CACHE_MISS]
         
-        # Apply feature transformer if available
-        transformer = get_feature_transformer()
-        if transformer:
+        n_features = model_n_features.get(model_name, 0)
+        if misses:
+            # Predict together with any concurrent requests for the same model
             try:
-                input_df = transformer.transform(input_df)
-            except Exception as e:
-                logger.error(f"Error applying feature transformer: {e}")
-                raise HTTPException(
-                    status_code=500, 
-                    detail=f"Error applying feature transformer: {str(e)}"
+                miss_predictions, n_features = await batch_scheduler.submit(
+                    model_name, [rows[i] for i in misses]
                 )
+            except HTTPException:
+                model_metrics[model_name].errors.inc()
+                raise
+            
+            for i, prediction in zip(misses, miss_predictions):
+                cached[i] = prediction
+                prediction_cache[keys[i]] = prediction
         
-        # Make predictions
-        try:
-            predictions = model.predict(input_df).tolist()
-        except Exception as e:
-            logger.error(f"Error making predictions: {e}")
-            PREDICTION_COUNT.labels(model=model_name, status="error").inc()
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Error making predictions: {str(e)}"
-            )
+        # Keep the model's output array as-is when nothing was cached;
+        # non-numeric labels are rebuilt as objects so none get truncated
+        if len(misses) == len(rows):
+            predictions = miss_predictions
+        elif misses and miss_predictions.dtype.kind not in "biuf":
+            predictions = np.asarray(cached, dtype=object)
+        else:
+            predictions = np.asarray(cached)
         
-        # Track metrics
-        prediction_time = (datetime.now() - start_time).total_seconds()
-        PREDICTION_COUNT.labels(model=model_name, status="success").inc()
-        PREDICTION_LATENCY.labels(model=model_name).observe(prediction_time)
-        FEATURE_COUNT.labels(model=model_name).inc(input_df.shape[1])
+        return _prediction_response(
+            model_name, predictions, (len(rows), n_features), start_ns, timestamp
+        )
+    
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        PREDICTION_COUNT.labels(model=model_name, status="error").inc()
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Unexpected error: {str(e)}"
+        )
+
+
+def _record_prediction(
+    model_name: str,
+    num_predictions: int,
+    features_shape: Tuple[int, int],
+    start_ns: int,
+    timestamp: str,
+) -> float:
+    """Record metrics and logs for a completed prediction and return its latency."""
+    prediction_time = (time.perf_counter_ns() - start_ns) * 1e-9
+    metrics = model_metrics[model_name]
+    metrics.success.inc()
+    metrics.latency.observe(prediction_time)
+    if features_shape[1]:
+        metrics.features.inc(features_shape[1])
+    
+    # Log prediction asynchronously
+    log_prediction(model_name, features_shape, num_predictions, prediction_time, timestamp)
+    
+    return prediction_time
+
+
+def _prediction_response(
+    model_name: str,
+    predictions: np.ndarray,
+    features_shape: Tuple[int, int],
+    start_ns: int,
+    timestamp: str,
+) -> ORJSONResponse:
+    """Record metrics and logs for a completed prediction and build its response."""
+    # orjson serializes numeric arrays natively; anything else (e.g. string
+    # class labels) needs converting to Python objects
+    if predictions.dtype.kind not in "biuf":
+        predictions = predictions.tolist()
+    
+    prediction_time = _record_prediction(
+        model_name, len(predictions), features_shape, start_ns, timestamp
+    )
+    
+    # Prepare response without re-validating it through pydantic
+    return ORJSONResponse({
+        "predictions": predictions,
+        "model": model_name,
+        "prediction_time": prediction_time,
+        "timestamp": timestamp,
+    })
+
+
+def _read_arrow_features(model_name: str, body: bytes) -> pd.DataFrame:
+    """
+    Decode an Arrow IPC stream into the model's input frame.
+    
+    Columns are selected in the model's declared feature order and handed to
+    pandas without consolidating them into a single block.
+    
+    Args:
+        model_name: Name of the model the features are for
+        body: Arrow IPC stream bytes
+        
+    Returns:
+        Input DataFrame, one row per instance
         
-        # Log prediction asynchronously
-        background_tasks.add_task(
-            log_prediction, model_name, input_df, predictions, prediction_time
+    Raises:
+        HTTPException: If the stream is invalid or declared features are missing
+    """
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except pa.ArrowInvalid as e:
+        raise HTTPException(status_code=422, detail=f"Invalid Arrow stream: {e}")
+    
+    feature_names = model_features.get(model_name)
+    if feature_names:
+        missing = [name for name in feature_names if name not in table.column_names]
+        if missing:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Missing feature columns: {', '.join(missing)}"
+            )
+        table = table.select(feature_names)
+    
+    return table.to_pandas(split_blocks=True)
+
+
+async def _predict_arrow(raw_request: Request, start_ns: int, timestamp: str) -> ORJSONResponse:
+    """
+    Predict on an Arrow IPC stream body without going through JSON.
+    
+    The model is taken from the ``model`` query parameter.
+    """
+    model_name = raw_request.query_params.get("model") or config.default_model
+    if not model_name:
+        raise HTTPException(
+            status_code=400, 
+            detail="No model specified and no default model configured"
         )
+    
+    try:
+        await aload_model(model_name)
+        input_df = _read_arrow_features(model_name, await raw_request.body())
         
-        # Prepare response
-        return PredictionResponse(
-            predictions=predictions,
-            model=model_name,
-            prediction_time=prediction_time,
-            timestamp=start_time.isoformat(),
+        try:
+            predictions, n_features = await asyncio.get_running_loop().run_in_executor(
+                INFERENCE_POOL, _predict_matrix, model_name, input_df
+            )
+        except HTTPException:
+            model_metrics[model_name].errors.inc()
+            raise
+        
+        return _prediction_response(
+            model_name, predictions, (len(input_df), n_features), start_ns, timestamp
         )
     
     except HTTPException:
@@ -376,17 +1026,211 @@ async def predict(
         )
 
 
-@app.post("/batch-predict")
-async def batch_predict(request: PredictionRequest):
+def _prediction_stream(predictions: np.ndarray) -> bytes:
+    """
+    Encode predictions as an Arrow IPC stream with one ``prediction`` column.
+    
+    Multi-output predictions (class probabilities, multi-unit Keras heads)
+    become a fixed-size list per row.
+    
+    Args:
+        predictions: Model output, one row per instance
+        
+    Returns:
+        Arrow IPC stream bytes
+    """
+    if predictions.ndim > 1:
+        rows = predictions.reshape(len(predictions), -1)
+        column = pa.FixedSizeListArray.from_arrays(pa.array(rows.ravel()), rows.shape[1])
+    else:
+        column = pa.array(predictions)
+    
+    table = pa.table({"prediction": column})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@app.websocket("/ws/predict")
+async def predict_ws(websocket: WebSocket):
+    """
+    Serve predictions over a persistent websocket connection.
+    
+    The model is taken from the ``model`` query parameter. Each binary
+    message is an Arrow IPC stream of feature rows; the reply is an Arrow
+    IPC stream with a single ``prediction`` column. A failed message is
+    answered with a JSON text message and the connection stays open.
+    
+    Args:
+        websocket: Client websocket connection
+    """
+    model_name = websocket.query_params.get("model") or config.default_model
+    if model_name not in config.models:
+        await websocket.close(code=1008)
+        return
+    
+    try:
+        await aload_model(model_name)
+    except HTTPException as e:
+        logger.error(f"Error loading model {model_name} for websocket: {e.detail}")
+        await websocket.close(code=1011)
+        return
+    
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    
+    try:
+        while True:
+            body = await websocket.receive_bytes()
+            start_ns = time.perf_counter_ns()
+            timestamp = datetime.now().isoformat()
+            
+            try:
+                input_df = _read_arrow_features(model_name, body)
+                predictions, n_features = await loop.run_in_executor(
+                    INFERENCE_POOL, _predict_matrix, model_name, input_df
+                )
+                reply = _prediction_stream(predictions)
+            except HTTPException as e:
+                model_metrics[model_name].errors.inc()
+                await websocket.send_text(orjson.dumps({"detail": e.detail}).decode())
+                continue
+            except Exception as e:
+                logger.error(f"Unexpected websocket prediction error: {e}")
+                model_metrics[model_name].errors.inc()
+                await websocket.send_text(
+                    orjson.dumps({"detail": f"Unexpected error: {str(e)}"}).decode()
+                )
+                continue
+            
+            _record_prediction(
+                model_name, len(predictions), (len(input_df), n_features), start_ns, timestamp
+            )
+            await websocket.send_bytes(reply)
+    
+    except WebSocketDisconnect:
+        pass
+
+
+async def _stream_predictions(
+    model_name: str, rows: List[Dict[str, Any]], start_ns: int, timestamp: str
+):
+    """
+    Predict rows in chunks, yielding one ND-JSON line per chunk.
+    
+    Each line holds the chunk index ``i`` and its ``predictions``; a final
+    line carries the model, total prediction time and timestamp. If a chunk
+    fails, an ``error`` line is sent instead and the stream ends.
+    """
+    loop = asyncio.get_running_loop()
+    metrics = model_metrics[model_name]
+    n_features = 0
+    
+    for i, start in enumerate(range(0, len(rows), STREAM_CHUNK_SIZE)):
+        try:
+            predictions, n_features = await loop.run_in_executor(
+                INFERENCE_POOL, _predict_batch, model_name, rows[start:start + STREAM_CHUNK_SIZE]
+            )
+        except HTTPException as e:
+            metrics.errors.inc()
+            yield orjson.dumps({"i": i, "error": e.detail}) + b"\n"
+            return
+        
+        if predictions.dtype.kind not in "biuf":
+            predictions = predictions.tolist()
+        yield orjson.dumps(
+            {"i": i, "predictions": predictions}, option=orjson.OPT_SERIALIZE_NUMPY
+        ) + b"\n"
+    
+    prediction_time = _record_prediction(
+        model_name, len(rows), (len(rows), n_features), start_ns, timestamp
+    )
+    
+    yield orjson.dumps({
+        "model": model_name,
+        "prediction_time": prediction_time,
+        "timestamp": timestamp,
+    }) + b"\n"
+
+
+def _make_model_predict(model_name: str):
+    """
+    Build a ``/predict`` handler specialized for one model.
+    
+    The model name, declared features and bound metrics are captured once,
+    so the handler skips the generic endpoint's model resolution, label
+    lookups, content negotiation and prediction cache, and goes straight to
+    the micro-batching scheduler.
+    
+    Args:
+        model_name: Name of the model to serve
+        
+    Returns:
+        Request handler for the model
+    """
+    feature_names = model_features.get(model_name)
+    metrics = model_metrics[model_name]
+    submit = batch_scheduler.submit
+    
+    async def predict_model(raw_request: Request):
+        start_ns = time.perf_counter_ns()
+        timestamp = datetime.now().isoformat()
+        
+        request = await decode_prediction_request(raw_request)
+        if model_name not in loaded_models:
+            await aload_model(model_name)
+        
+        rows = [item.features for item in request.data]
+        if feature_names:
+            _validate_features(model_name, rows)
+        
+        try:
+            predictions, n_features = await submit(model_name, rows)
+        except HTTPException:
+            metrics.errors.inc()
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            metrics.errors.inc()
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Unexpected error: {str(e)}"
+            )
+        
+        return _prediction_response(
+            model_name, predictions, (len(rows), n_features), start_ns, timestamp
+        )
+    
+    predict_model.__name__ = f"predict_{model_name}"
+    predict_model.__doc__ = f"Make predictions using the '{model_name}' model."
+    return predict_model
+
+
+# Register one specialized prediction endpoint per configured model
+for _model_name in config.models:
+    app.add_api_route(
+        f"/predict/{_model_name}",
+        _make_model_predict(_model_name),
+        methods=["POST"],
+        response_class=ORJSONResponse,
+        responses={200: {"model": PredictionResponse}},
+        openapi_extra=PREDICTION_REQUEST_BODY,
+    )
+
+
+@app.post("/batch-predict", openapi_extra=PREDICTION_REQUEST_BODY)
+async def batch_predict(raw_request: Request):
     """
     Schedule a batch prediction job.
     
     Args:
-        request: Prediction request
+        raw_request: HTTP request carrying a JSON prediction request
         
     Returns:
         Job information
     """
+    request = await decode_prediction_request(raw_request)
     model_name = request.model or config.default_model
     
     if not model_name:
@@ -408,13 +1252,21 @@ async def batch_predict(request: PredictionRequest):
     }
 
 
+@app.post("/cache/clear")
+async def clear_cache():
+    """Clear the prediction cache, e.g. after redeploying a model."""
+    cleared = len(prediction_cache)
+    prediction_cache.clear()
+    return {"cleared": cleared}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     # Check if we can access the default model
     try:
         if config.default_model:
-            _ = load_model(config.default_model)
+            _ = await aload_model(config.default_model)
         
         return {"status": "healthy"}
     except Exception as e:
@@ -426,38 +1278,118 @@ async def health_check():
 
 
 # Helper functions
+class PredictionLogWriter:
+    """Appends prediction log entries to daily JSONL files from a background thread."""
+
+    def __init__(self, log_dir: str = "logs", max_batch: int = 256, max_queue: int = 100_000):
+        """
+        Initialize the writer.
+        
+        Args:
+            log_dir: Directory for the daily prediction log files
+            max_batch: Maximum number of entries written per write call
+            max_queue: Maximum number of pending entries before new ones are dropped
+        """
+        self.log_dir = log_dir
+        self.max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._file_date: Optional[str] = None
+    
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if self._thread is not None:
+            return
+        
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._drain, name="prediction-log", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush pending entries and stop the writer thread."""
+        if self._thread is None:
+            return
+        
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def put(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry without blocking; drops it if the queue is full."""
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            logger.warning("Prediction log queue is full; dropping entry")
+    
+    def _open_for_today(self):
+        """Return the log file for the current day, rotating at midnight."""
+        today = datetime.now().strftime("%Y%m%d")
+        if today != self._file_date:
+            if self._file is not None:
+                self._file.close()
+            log_file = os.path.join(self.log_dir, f"predictions_{today}.jsonl")
+            self._file = open(log_file, "ab", buffering=1 << 20)
+            self._file_date = today
+        return self._file
+    
+    def _drain(self) -> None:
+        """Write queued entries in batches until stopped."""
+        stopping = False
+        while not stopping:
+            entries = [self._queue.get()]
+            while len(entries) < self.max_batch:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if None in entries:
+                stopping = True
+                entries = [entry for entry in entries if entry is not None]
+            
+            try:
+                log_fp = self._open_for_today()
+                log_fp.write(b"".join(orjson.dumps(entry) + b"\n" for entry in entries))
+                log_fp.flush()
+            except Exception as e:
+                logger.error(f"Error logging prediction: {e}")
+        
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_date = None
+
+
+prediction_log = PredictionLogWriter()
+
+
 def log_prediction(
-    model_name: str, features: pd.DataFrame, predictions: List[Any], latency: float
+    model_name: str,
+    features_shape: Tuple[int, int],
+    num_predictions: int,
+    latency: float,
+    timestamp: str,
 ) -> None:
     """
     Log a prediction to a file or database.
     
     Args:
         model_name: Name of the model used
-        features: Input features
-        predictions: Predicted values
+        features_shape: Shape of the input features
+        num_predictions: Number of predicted values
         latency: Prediction latency in seconds
+        timestamp: Timestamp of the prediction
     """
     # In a real application, you might log to a database or monitoring system
     # For simplicity, we'll just log to a file
-    try:
-        log_dir = "logs"
-        os.makedirs(log_dir, exist_ok=True)
-        
-        log_file = os.path.join(log_dir, f"predictions_{datetime.now().strftime('%Y%m%d')}.jsonl")
-        
-        with open(log_file, "a") as f:
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "model": model_name,
-                "features_shape": features.shape,
-                "num_predictions": len(predictions),
-                "latency": latency,
-            }
-            f.write(json.dumps(log_entry) + "\n")
-    
-    except Exception as e:
-        logger.error(f"Error logging prediction: {e}")
+    prediction_log.put({
+        "timestamp": timestamp,
+        "model": model_name,
+        "features_shape": features_shape,
+        "num_predictions": num_predictions,
+        "latency": latency,
+    })
 
 
 @app.on_event("startup")
@@ -465,34 +1397,40 @@ async def startup_event():
     """Startup event handler."""
     logger.info("Starting ML Model API")
     
-    # Start Prometheus metrics server
-    try:
-        start_http_server(8000)
-        logger.info("Started Prometheus metrics server on port 8000")
-    except Exception as e:
-        logger.error(f"Failed to start Prometheus metrics server: {e}")
-    
     # Preload default model if configured
     if config.default_model:
         try:
-            load_model(config.default_model)
+            await aload_model(config.default_model)
             logger.info(f"Preloaded default model '{config.default_model}'")
         except Exception as e:
             logger.error(f"Failed to preload default model: {e}")
     
-    # Load feature transformer if configured
-    if config.feature_transformer_path:
-        try:
-            get_feature_transformer()
-        except Exception as e:
-            logger.error(f"Failed to load feature transformer: {e}")
+    # Load feature transformer if configured; serving without it would
+    # return wrong predictions, so a failure stops startup
+    get_feature_transform()
+    
+    # Start micro-batching workers and the prediction log writer
+    batch_scheduler.start(list(config.models))
+    prediction_log.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Shutdown event handler."""
+    await batch_scheduler.stop()
+    INFERENCE_POOL.shutdown(wait=False)
+    prediction_log.stop()
 
 
 if __name__ == "__main__":
-    # Run the API server
+    # Run the API server with the configured number of worker processes
     uvicorn.run(
         "model_api:app",
-        host="0.0.0.0",
-        port=8080,
-        reload=True,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=config.api.get("host", "0.0.0.0"),
+        port=int(config.api.get("port", 8080)),
+        workers=API_WORKERS,
+        loop="uvloop",
+        http="httptools",
+        reload=False,
     ) 
\ No newline at end of file
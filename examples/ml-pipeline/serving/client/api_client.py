@@ -6,10 +6,41 @@ A simple client for the ML model serving API.
 """
 
 import argparse
-import json
+import asyncio
 import time
 from typing import Dict, List, Any, Optional
+from urllib.parse import urlencode
+import httpx
+import numpy as np
+import orjson
+import pyarrow as pa
 import requests
+import websockets
+from requests.adapters import HTTPAdapter
+
+
+def encode_arrow_stream(X: np.ndarray, feature_names: List[str]) -> bytes:
+    """
+    Encode a feature matrix as an Arrow IPC stream.
+    
+    Args:
+        X: Feature matrix with one row per instance
+        feature_names: Column names of X
+        
+    Returns:
+        Arrow IPC stream bytes
+    """
+    X = np.asarray(X)
+    if X.ndim != 2 or X.shape[1] != len(feature_names):
+        raise ValueError("X must be 2-D with one column per feature name")
+    
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array(column) for column in X.T], names=feature_names
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
 
 
 class ModelAPIClient:
@@ -23,6 +54,12 @@ class ModelAPIClient:
             base_url: Base URL of the API
         """
         self.base_url = base_url.rstrip("/")
+        
+        # Reuse pooled keep-alive connections across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=128)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -31,7 +68,7 @@ class ModelAPIClient:
         Returns:
             Health status
         """
-        response = requests.get(f"{self.base_url}/health")
+        response = self.session.get(f"{self.base_url}/health")
         response.raise_for_status()
         return response.json()
     
@@ -42,7 +79,7 @@ class ModelAPIClient:
         Returns:
             Models information
         """
-        response = requests.get(f"{self.base_url}/models")
+        response = self.session.get(f"{self.base_url}/models")
         response.raise_for_status()
         return response.json()["models"]
     
@@ -56,12 +93,15 @@ class ModelAPIClient:
         Returns:
             Model information
         """
-        response = requests.get(f"{self.base_url}/models/{model_name}")
+        response = self.session.get(f"{self.base_url}/models/{model_name}")
         response.raise_for_status()
         return response.json()
     
     def predict(
-        self, features: List[Dict[str, Any]], model_name: Optional[str] = None
+        self,
+        features: List[Dict[str, Any]],
+        model_name: Optional[str] = None,
+        stream: bool = False,
     ) -> Dict[str, Any]:
         """
         Make predictions with a model.
@@ -69,6 +109,8 @@ class ModelAPIClient:
         Args:
             features: List of feature dictionaries
             model_name: Name of the model to use (optional)
+            stream: Receive predictions as ND-JSON chunks while they are
+                computed, instead of one JSON document at the end
             
         Returns:
             Prediction results
@@ -79,7 +121,61 @@ class ModelAPIClient:
         if model_name:
             payload["model"] = model_name
         
-        response = requests.post(f"{self.base_url}/predict", json=payload)
+        if not stream:
+            response = self.session.post(f"{self.base_url}/predict", json=payload)
+            response.raise_for_status()
+            return response.json()
+        
+        response = self.session.post(
+            f"{self.base_url}/predict",
+            json=payload,
+            headers={"Accept": "application/x-ndjson"},
+            stream=True,
+        )
+        response.raise_for_status()
+        
+        # Chunks arrive in order; the last line carries the response metadata
+        result: Dict[str, Any] = {}
+        predictions: List[Any] = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            message = orjson.loads(line)
+            if "error" in message:
+                raise requests.exceptions.HTTPError(message["error"], response=response)
+            if "predictions" in message:
+                predictions.extend(message["predictions"])
+            else:
+                result = message
+        
+        result["predictions"] = predictions
+        return result
+    
+    def predict_matrix(
+        self,
+        X: np.ndarray,
+        feature_names: List[str],
+        model_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make predictions for a feature matrix sent as an Arrow IPC stream.
+        
+        Avoids building one dictionary per row and encoding it as JSON.
+        
+        Args:
+            X: Feature matrix with one row per instance
+            feature_names: Column names of X
+            model_name: Name of the model to use (optional)
+            
+        Returns:
+            Prediction results
+        """
+        response = self.session.post(
+            f"{self.base_url}/predict",
+            data=encode_arrow_stream(X, feature_names),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+            params={"model": model_name} if model_name else None,
+        )
         response.raise_for_status()
         return response.json()
     
@@ -102,11 +198,117 @@ class ModelAPIClient:
         if model_name:
             payload["model"] = model_name
         
-        response = requests.post(f"{self.base_url}/batch-predict", json=payload)
+        response = self.session.post(f"{self.base_url}/batch-predict", json=payload)
         response.raise_for_status()
         return response.json()
 
 
+class AsyncModelAPIClient:
+    """Asynchronous client for submitting many prediction requests concurrently."""
+
+    def __init__(self, base_url: str = "http://localhost:8080", max_connections: int = 128):
+        """
+        Initialize the client.
+        
+        Args:
+            base_url: Base URL of the API
+            max_connections: Maximum number of pooled connections
+        """
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+    
+    async def __aenter__(self) -> "AsyncModelAPIClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying connection pool."""
+        await self.client.aclose()
+    
+    async def predict(
+        self, features: List[Dict[str, Any]], model_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Make predictions with a model.
+        
+        Args:
+            features: List of feature dictionaries
+            model_name: Name of the model to use (optional)
+            
+        Returns:
+            Prediction results
+        """
+        payload = {"data": [{"features": f} for f in features]}
+        
+        if model_name:
+            payload["model"] = model_name
+        
+        response = await self.client.post("/predict", json=payload)
+        response.raise_for_status()
+        return response.json()
+    
+    async def predict_many(
+        self, requests_features: List[List[Dict[str, Any]]], model_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Send several prediction requests in parallel.
+        
+        Args:
+            requests_features: One list of feature dictionaries per request
+            model_name: Name of the model to use (optional)
+            
+        Returns:
+            Prediction results in request order
+        """
+        return await asyncio.gather(
+            *(self.predict(features, model_name) for features in requests_features)
+        )
+    
+    async def predict_matrices(
+        self,
+        matrices: List[np.ndarray],
+        feature_names: List[str],
+        model_name: Optional[str] = None,
+    ) -> List[np.ndarray]:
+        """
+        Predict several feature matrices over one websocket connection.
+        
+        Each matrix is sent as an Arrow IPC stream and answered in order, so
+        the connection and HTTP framing are set up only once.
+        
+        Args:
+            matrices: Feature matrices with one row per instance
+            feature_names: Column names of each matrix
+            model_name: Name of the model to use (optional)
+            
+        Returns:
+            Predictions for each matrix, in order
+        """
+        ws_url = "ws" + self.base_url[len("http"):] + "/ws/predict"
+        if model_name:
+            ws_url += f"?{urlencode({'model': model_name})}"
+        
+        results = []
+        async with websockets.connect(ws_url) as websocket:
+            for X in matrices:
+                await websocket.send(encode_arrow_stream(X, feature_names))
+                reply = await websocket.recv()
+                if isinstance(reply, str):
+                    raise RuntimeError(f"Prediction failed: {orjson.loads(reply)['detail']}")
+                table = pa.ipc.open_stream(reply).read_all()
+                results.append(table.column("prediction").to_numpy())
+        
+        return results
+
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="ML Model API Client")
@@ -135,6 +337,9 @@ def parse_args():
     predict_parser.add_argument(
         "--features", required=True, help="JSON string or path to JSON file with features"
     )
+    predict_parser.add_argument(
+        "--stream", action="store_true", help="Stream predictions as ND-JSON chunks"
+    )
     
     # Batch predict command
     batch_parser = subparsers.add_parser("batch-predict", help="Schedule batch predictions")
@@ -160,12 +365,12 @@ def load_features(features_arg: str) -> List[Dict[str, Any]]:
     """
     # Try to parse as JSON string
     try:
-        return json.loads(features_arg)
-    except json.JSONDecodeError:
-        # Try to load from file
+        return orjson.loads(features_arg)
+    except orjson.JSONDecodeError:
+        # Try to load from file; orjson decodes the raw bytes directly
         try:
-            with open(features_arg, "r") as f:
-                return json.load(f)
+            with open(features_arg, "rb") as f:
+                return orjson.loads(f.read())
         except Exception as e:
             raise ValueError(f"Failed to load features: {e}")
 
@@ -199,7 +404,7 @@ def main():
             features = load_features(args.features)
             
             start_time = time.time()
-            result = client.predict(features, args.model)
+            result = client.predict(features, args.model, stream=args.stream)
             elapsed = time.time() - start_time
             
             print(f"Model: {result['model']}")
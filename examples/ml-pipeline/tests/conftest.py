@@ -0,0 +1,19 @@
+"""
+Shared test configuration.
+
+Puts the pipeline's source directories on the import path the same way the
+modules themselves expect to be run.
+"""
+
+import os
+import sys
+
+PIPELINE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (
+    PIPELINE_ROOT,
+    os.path.join(PIPELINE_ROOT, "training"),
+    os.path.join(PIPELINE_ROOT, "serving", "api"),
+):
+    if path not in sys.path:
+        sys.path.insert(0, path)
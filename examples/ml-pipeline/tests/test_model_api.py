@@ -0,0 +1,46 @@
+"""Tests for the serving API's feature transformer loading."""
+
+from types import SimpleNamespace
+
+import pytest
+
+for module in ("fastapi", "mlflow", "msgspec", "numba", "pyarrow", "cachetools", "category_encoders"):
+    pytest.importorskip(module)
+
+import model_api
+from fastapi import HTTPException
+
+
+@pytest.fixture(autouse=True)
+def clear_transform_cache():
+    model_api.get_feature_transform.cache_clear()
+    yield
+    model_api.get_feature_transform.cache_clear()
+
+
+def test_failed_transformer_load_is_retried(monkeypatch):
+    transformer = SimpleNamespace(transform=lambda X: X)
+    attempts = []
+
+    def load(path):
+        attempts.append(path)
+        if len(attempts) == 1:
+            raise OSError("transformer file not ready")
+        return transformer
+
+    monkeypatch.setattr(model_api.config, "feature_transformer_path", "transformer.pkl")
+    monkeypatch.setattr(model_api.FeatureTransformer, "load", load)
+
+    with pytest.raises(HTTPException) as excinfo:
+        model_api.get_feature_transform()
+    assert excinfo.value.status_code == 503
+
+    assert model_api.get_feature_transform() is transformer.transform
+    assert model_api.get_feature_transform() is transformer.transform
+    assert len(attempts) == 2
+
+
+def test_no_transformer_configured(monkeypatch):
+    monkeypatch.setattr(model_api.config, "feature_transformer_path", None)
+
+    assert model_api.get_feature_transform() is None
@@ -0,0 +1,75 @@
+"""Tests for the model evaluator's prediction cache and metrics."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("orjson")
+
+from sklearn.linear_model import LogisticRegression
+
+from evaluation.model_evaluator import ModelEvaluator
+
+
+@pytest.fixture
+def evaluator(tmp_path):
+    return ModelEvaluator(output_dir=str(tmp_path), enable_plots=False)
+
+
+@pytest.fixture
+def binary_data():
+    X = np.arange(40, dtype=np.float64).reshape(20, 2)
+    y = (X[:, 0] > 20).astype(int)
+    return X, y
+
+
+def test_predictions_are_cached_for_an_unchanged_model(evaluator, binary_data, monkeypatch):
+    X, y = binary_data
+    model = LogisticRegression().fit(X, y)
+
+    calls = []
+    run_model = evaluator._run_model
+
+    def counting_run_model(*args, **kwargs):
+        calls.append(args)
+        return run_model(*args, **kwargs)
+
+    monkeypatch.setattr(evaluator, "_run_model", counting_run_model)
+
+    first, _ = evaluator._predict_once(model, X, "classification")
+    second, _ = evaluator._predict_once(model, X, "classification")
+
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first, second)
+
+
+def test_refitting_a_model_in_place_invalidates_its_predictions(evaluator, binary_data):
+    X, y = binary_data
+    model = LogisticRegression().fit(X, y)
+    before, _ = evaluator._predict_once(model, X, "classification")
+
+    model.fit(X, 1 - y)
+    after, _ = evaluator._predict_once(model, X, "classification")
+
+    assert not np.array_equal(before, after)
+    np.testing.assert_array_equal(after, model.predict(X))
+
+
+def test_object_arrays_are_digested_by_value():
+    X = np.array([[1, "a"], [2, "b"]], dtype=object)
+
+    digest = ModelEvaluator._data_digest(X)
+
+    assert len(digest) == 16
+    assert ModelEvaluator._data_digest(X.copy()) == digest
+    assert ModelEvaluator._data_digest(np.array([[1, "a"], [2, "c"]], dtype=object)) != digest
+
+
+def test_binary_metrics_report_label_one(evaluator):
+    y_true = np.array([1, 1, 2, 2])
+    y_pred = np.array([1, 2, 2, 2])
+
+    metrics, _ = evaluator._classification_metrics(y_true, y_pred, None, 2)
+
+    assert metrics["precision"] == pytest.approx(1.0)
+    assert metrics["recall"] == pytest.approx(0.5)
@@ -0,0 +1,47 @@
+"""Tests for model factory configuration handling."""
+
+import logging
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("psutil")
+
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+
+from models.model_factory import ModelFactory, NNConfig, _coerce_config
+
+
+def test_coerce_config_ignores_unknown_keys(caplog):
+    with caplog.at_level(logging.WARNING):
+        cfg = _coerce_config(NNConfig, {"hidden_layers": [16, 8], "learning_rate": 0.01})
+
+    assert cfg.hidden_layers == (16, 8)
+    assert "learning_rate" in caplog.text
+
+
+def test_coerce_config_returns_config_instances_unchanged():
+    cfg = NNConfig(hidden_layers=(4,))
+
+    assert _coerce_config(NNConfig, cfg) is cfg
+
+
+def test_tensorcore_alignment_pads_only_mixed_precision():
+    sizes = (30, 64, 1)
+
+    assert ModelFactory._tensorcore_aligned(NNConfig(), sizes) == sizes
+    assert ModelFactory._tensorcore_aligned(NNConfig(precision="mixed_float16"), sizes) == (32, 64, 8)
+
+
+def test_gradient_boosting_defaults_to_hist():
+    model = ModelFactory.create_gradient_boosting({})
+
+    assert isinstance(model, HistGradientBoostingRegressor)
+    assert model.min_samples_leaf == 1
+
+
+def test_gradient_boosting_falls_back_to_exact_for_subsample():
+    model = ModelFactory.create_gradient_boosting({"subsample": 0.8})
+
+    assert isinstance(model, GradientBoostingRegressor)
+    assert model.subsample == 0.8
@@ -0,0 +1,79 @@
+"""Tests for the model trainer's data preparation and metrics."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("mlflow")
+pytest.importorskip("optuna")
+
+from trainers.model_trainer import ModelTrainer, _classification_metrics
+
+
+@pytest.fixture
+def trainer(tmp_path):
+    return ModelTrainer(
+        experiment_name="test",
+        model_type="logistic_regression",
+        model_config={},
+        tracking_uri=f"file:{tmp_path / 'mlruns'}",
+        artifacts_dir=str(tmp_path / "artifacts"),
+    )
+
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(100, 3)), columns=["a", "b", "c"])
+    y = pd.Series(np.tile([0, 1], 50))
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "y_true, y_pred",
+    [
+        ([0, 0, 1, 1], [0, 1, 1, 0]),
+        ([1, 1, 2, 2], [2, 1, 2, 1]),
+    ],
+)
+def test_binary_metrics_use_label_one_as_positive(y_true, y_pred):
+    metrics = _classification_metrics(np.array(y_true), np.array(y_pred), 2)
+
+    assert metrics["accuracy"] == pytest.approx(0.5)
+    assert metrics["precision"] == pytest.approx(0.5)
+    assert metrics["recall"] == pytest.approx(0.5)
+
+
+def test_binary_metrics_without_label_one_use_the_larger_label():
+    metrics = _classification_metrics(np.array(["a", "b", "b"]), np.array(["a", "b", "a"]), 2)
+
+    assert metrics["precision"] == pytest.approx(1.0)
+    assert metrics["recall"] == pytest.approx(0.5)
+
+
+def test_binary_metrics_reject_more_than_two_labels():
+    with pytest.raises(ValueError):
+        _classification_metrics(np.array([0, 1, 1]), np.array([0, 1, 2]), 2)
+
+
+def test_prepare_data_keeps_dtype_and_feature_names_by_default(trainer, features):
+    X, y = features
+
+    data = trainer.prepare_data(X, y)
+
+    assert isinstance(data["X_train"], pd.DataFrame)
+    assert list(data["X_train"].columns) == ["a", "b", "c"]
+    assert (data["X_train"].dtypes == np.float64).all()
+    assert len(data["X_train"]) + len(data["X_val"]) + len(data["X_test"]) == len(X)
+
+
+def test_prepare_data_converts_frames_and_arrays_alike(trainer, features):
+    X, y = features
+
+    frame_data = trainer.prepare_data(X, y, float32=True)
+    array_data = trainer.prepare_data(X.to_numpy(), y.to_numpy(), float32=True)
+
+    assert (frame_data["X_train"].dtypes == np.float32).all()
+    assert array_data["X_train"].dtype == np.float32
+    np.testing.assert_array_equal(frame_data["X_train"].to_numpy(), array_data["X_train"])
@@ -5,30 +5,33 @@ This module provides utilities for comprehensive model evaluation.
 """
 
 import os
-import json
+import functools
 import logging
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from hashlib import blake2b
 from typing import Dict, List, Tuple, Any, Optional, Union, Callable
 import pickle
 
 import numpy as np
+import orjson
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import scipy.sparse as sp
+from joblib import Parallel, delayed, hash as joblib_hash
 
 from sklearn.metrics import (
+    auc,
     confusion_matrix, 
-    accuracy_score, 
-    precision_score, 
-    recall_score, 
-    f1_score,
     roc_curve, 
     roc_auc_score, 
     precision_recall_curve, 
+    precision_recall_fscore_support,
     average_precision_score,
     mean_squared_error, 
     mean_absolute_error, 
     r2_score,
-    classification_report,
 )
 
 # Configure logging
@@ -38,26 +41,139 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Scatter plots saturate visually well before this many points
+MAX_SCATTER_POINTS = 20_000
+
+# Largest integer label counted with np.bincount rather than np.unique
+MAX_BINCOUNT_LABEL = 1 << 20
+
+# Bump to invalidate cached plot images after changing how plots are drawn
+PLOT_CACHE_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _pyplot():
+    """
+    Import pyplot on first use, rendering off-screen with the Agg backend.
+    
+    Keeps matplotlib out of the import cost of metric-only evaluations.
+    
+    Returns:
+        The matplotlib.pyplot module
+    """
+    import matplotlib
+    
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    
+    return plt
+
+
+def _cached_plot(name: str) -> Callable:
+    """
+    Skip re-rendering a plot whose inputs have been rendered before.
+    
+    The decorated ``_plot_*`` method's arguments are hashed together with
+    the plot settings, PLOT_CACHE_VERSION and the method's bytecode; a PNG
+    rendered for the same key is kept under ``{output_dir}/.cache`` and
+    copied to the new timestamped path instead of drawing the figure again.
+    
+    Args:
+        name: Plot name used in the output file names
+        
+    Returns:
+        Decorator for ModelEvaluator plot methods
+    """
+    def decorator(plot_fn: Callable) -> Callable:
+        settings = {
+            "version": PLOT_CACHE_VERSION,
+            "code": blake2b(plot_fn.__code__.co_code, digest_size=8).hexdigest(),
+            "max_scatter_points": MAX_SCATTER_POINTS,
+        }
+        
+        @functools.wraps(plot_fn)
+        def wrapper(self, *args, timestamp: Optional[str] = None, **kwargs) -> Optional[str]:
+            timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+            digest = _inputs_digest((settings, *args), kwargs)
+            cache_path = os.path.join(self.output_dir, ".cache", f"{name}_{digest}.png")
+            
+            if os.path.exists(cache_path):
+                plot_path = os.path.join(self.output_dir, f"{name}_{timestamp}.png")
+                shutil.copyfile(cache_path, plot_path)
+                return plot_path
+            
+            plot_path = plot_fn(self, *args, timestamp=timestamp, **kwargs)
+            if plot_path:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                shutil.copyfile(plot_path, cache_path)
+            return plot_path
+        
+        return wrapper
+    
+    return decorator
+
+
+def _inputs_digest(args: Tuple, kwargs: Dict[str, Any]) -> str:
+    """
+    Hash plot inputs (arrays, label lists and metric dicts).
+    
+    Args:
+        args: Positional plot arguments
+        kwargs: Keyword plot arguments
+        
+    Returns:
+        Hex digest of the inputs
+    """
+    digest = blake2b(digest_size=8)
+    for key, value in [*enumerate(args), *sorted(kwargs.items())]:
+        digest.update(str(key).encode())
+        if isinstance(value, (np.ndarray, pd.Series)) and np.asarray(value).dtype != object:
+            data = np.ascontiguousarray(value)
+            digest.update(repr((data.dtype.str, data.shape)).encode())
+            digest.update(data)
+        else:
+            if isinstance(value, (np.ndarray, pd.Series)):
+                value = value.tolist()
+            digest.update(orjson.dumps(
+                value,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                default=repr,
+            ))
+    return digest.hexdigest()
+
 
 class ModelEvaluator:
     """Class for comprehensive model evaluation."""
 
-    def __init__(self, output_dir: str = "./evaluation_results"):
+    def __init__(
+        self,
+        output_dir: str = "./evaluation_results",
+        prediction_cache_size: int = 32,
+        enable_plots: bool = True,
+    ):
         """
         Initialize the model evaluator.
         
         Args:
             output_dir: Directory to store evaluation results
+            prediction_cache_size: Number of (model, test set) predictions to keep
+            enable_plots: Whether to generate plots (metrics only if False)
         """
         self.output_dir = output_dir
+        self.enable_plots = enable_plots
         os.makedirs(output_dir, exist_ok=True)
         
+        # LRU cache of predictions keyed by fitted-model and test-set digests
+        self.prediction_cache_size = prediction_cache_size
+        self._prediction_cache: OrderedDict = OrderedDict()
+        self._prediction_cache_lock = threading.Lock()
+        
         logger.info(f"Initialized model evaluator with output directory: {output_dir}")
     
     def evaluate_classifier(
         self,
         model: Any,
-        X_test: Union[np.ndarray, pd.DataFrame],
+        X_test: Union[np.ndarray, pd.DataFrame, sp.spmatrix],
         y_test: Union[np.ndarray, pd.Series],
         class_names: Optional[List[str]] = None,
         threshold: float = 0.5,
@@ -76,71 +192,43 @@ class ModelEvaluator:
             Dictionary of evaluation metrics and paths to generated plots
         """
         logger.info("Evaluating classification model")
-        
-        # Get predictions
-        try:
-            # For models with predict_proba method (most sklearn models)
-            y_prob = model.predict_proba(X_test)
-            if y_prob.shape[1] == 2:  # Binary classification
-                y_prob = y_prob[:, 1]  # Probability of positive class
-                y_pred = (y_prob >= threshold).astype(int)
-            else:  # Multi-class
-                y_pred = np.argmax(y_prob, axis=1)
-        except (AttributeError, NotImplementedError):
-            # For models without predict_proba
-            y_pred = model.predict(X_test)
-            y_prob = None
+        y_test = np.ascontiguousarray(y_test)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Determine number of classes
-        n_classes = len(np.unique(y_test))
+        n_classes = self._count_classes(y_test)
+        
+        # Get predictions; probabilities are only used by binary metrics and plots
+        y_pred, y_prob = self._predict_once(
+            model, X_test, "classification", threshold, with_proba=n_classes == 2
+        )
         
         # Set class names if not provided
         if class_names is None:
             class_names = [f"Class {i}" for i in range(n_classes)]
         
         # Calculate metrics
-        metrics = {}
-        metrics["accuracy"] = accuracy_score(y_test, y_pred)
-        
-        # Binary classification specific metrics
-        if n_classes == 2:
-            metrics["precision"] = precision_score(y_test, y_pred)
-            metrics["recall"] = recall_score(y_test, y_pred)
-            metrics["f1"] = f1_score(y_test, y_pred)
-            
-            if y_prob is not None:
-                metrics["roc_auc"] = roc_auc_score(y_test, y_prob)
-                metrics["average_precision"] = average_precision_score(y_test, y_prob)
-        
-        # Multi-class metrics
-        else:
-            metrics["precision_macro"] = precision_score(y_test, y_pred, average="macro")
-            metrics["recall_macro"] = recall_score(y_test, y_pred, average="macro")
-            metrics["f1_macro"] = f1_score(y_test, y_pred, average="macro")
-            
-            # Per-class metrics
-            class_report = classification_report(y_test, y_pred, output_dict=True)
-            metrics["classification_report"] = class_report
+        metrics, cm = self._classification_metrics(y_test, y_pred, y_prob, n_classes)
         
         logger.info(f"Classification metrics: {metrics}")
         
         # Generate plots
         plots = {}
         
-        # Confusion matrix
-        plots["confusion_matrix"] = self._plot_confusion_matrix(
-            y_test, y_pred, class_names
-        )
-        
-        # ROC curve for binary classification
-        if n_classes == 2 and y_prob is not None:
-            plots["roc_curve"] = self._plot_roc_curve(y_test, y_prob)
-            plots["precision_recall_curve"] = self._plot_precision_recall_curve(
-                y_test, y_prob
+        if self.enable_plots:
+            # Confusion matrix
+            plots["confusion_matrix"] = self._plot_confusion_matrix(
+                y_test, y_pred, class_names, cm=cm, timestamp=timestamp
             )
+            
+            # ROC curve for binary classification
+            if n_classes == 2 and y_prob is not None:
+                plots["roc_curve"] = self._plot_roc_curve(y_test, y_prob, timestamp=timestamp)
+                plots["precision_recall_curve"] = self._plot_precision_recall_curve(
+                    y_test, y_prob, timestamp=timestamp
+                )
         
         # Save results
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
         results = {
             "metrics": metrics,
             "plots": plots,
@@ -151,19 +239,14 @@ class ModelEvaluator:
         metrics_path = os.path.join(
             self.output_dir, f"classification_metrics_{timestamp}.json"
         )
-        with open(metrics_path, "w") as f:
-            json.dump(
-                {k: v for k, v in metrics.items() if isinstance(v, (int, float, str, list))},
-                f,
-                indent=2,
-            )
+        self._write_json(metrics_path, metrics)
         
         return results
     
     def evaluate_regressor(
         self,
         model: Any,
-        X_test: Union[np.ndarray, pd.DataFrame],
+        X_test: Union[np.ndarray, pd.DataFrame, sp.spmatrix],
         y_test: Union[np.ndarray, pd.Series],
     ) -> Dict[str, Any]:
         """
@@ -178,36 +261,30 @@ class ModelEvaluator:
             Dictionary of evaluation metrics and paths to generated plots
         """
         logger.info("Evaluating regression model")
+        y_test = np.ascontiguousarray(y_test)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Get predictions
-        y_pred = model.predict(X_test)
+        y_pred, _ = self._predict_once(model, X_test, "regression")
         
         # Calculate metrics
-        metrics = {}
-        metrics["mse"] = mean_squared_error(y_test, y_pred)
-        metrics["rmse"] = np.sqrt(metrics["mse"])
-        metrics["mae"] = mean_absolute_error(y_test, y_pred)
-        metrics["r2"] = r2_score(y_test, y_pred)
-        
-        # Calculate additional metrics
-        metrics["median_absolute_error"] = np.median(np.abs(y_test - y_pred))
-        metrics["mean_absolute_percentage_error"] = np.mean(
-            np.abs((y_test - y_pred) / np.maximum(np.abs(y_test), 1e-10))
-        ) * 100
+        metrics = self._regression_metrics(y_test, y_pred)
         
         logger.info(f"Regression metrics: {metrics}")
         
         # Generate plots
         plots = {}
         
-        # Actual vs Predicted plot
-        plots["actual_vs_predicted"] = self._plot_actual_vs_predicted(y_test, y_pred)
-        
-        # Residual plot
-        plots["residuals"] = self._plot_residuals(y_test, y_pred)
+        if self.enable_plots:
+            # Actual vs Predicted plot
+            plots["actual_vs_predicted"] = self._plot_actual_vs_predicted(
+                y_test, y_pred, timestamp=timestamp
+            )
+            
+            # Residual plot
+            plots["residuals"] = self._plot_residuals(y_test, y_pred, timestamp=timestamp)
         
         # Save results
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
         results = {
             "metrics": metrics,
             "plots": plots,
@@ -218,16 +295,366 @@ class ModelEvaluator:
         metrics_path = os.path.join(
             self.output_dir, f"regression_metrics_{timestamp}.json"
         )
-        with open(metrics_path, "w") as f:
-            json.dump(metrics, f, indent=2)
+        self._write_json(metrics_path, metrics)
         
         return results
     
+    @staticmethod
+    def _count_classes(y: np.ndarray) -> int:
+        """
+        Count the distinct labels in y.
+        
+        Small non-negative integer labels are counted with one np.bincount
+        pass instead of sorting the whole array.
+        
+        Args:
+            y: Label array
+            
+        Returns:
+            Number of distinct labels
+        """
+        if y.dtype.kind in "iu" and y.size and 0 <= y.min() and y.max() < MAX_BINCOUNT_LABEL:
+            return int(np.count_nonzero(np.bincount(y)))
+        
+        return len(np.unique(y))
+    
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]) -> None:
+        """
+        Write metrics to a JSON file, serializing NumPy values directly.
+        
+        Args:
+            path: Output file path
+            data: Metrics to write
+        """
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+    
+    def _predict_once(
+        self,
+        model: Any,
+        X_test: Union[np.ndarray, pd.DataFrame, sp.spmatrix],
+        task_type: str,
+        threshold: float = 0.5,
+        with_proba: bool = True,
+        data_digest: Optional[bytes] = None,
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Run a model over the test features, reusing cached predictions.
+        
+        Args:
+            model: Trained model
+            X_test: Test features
+            task_type: Type of task ('classification' or 'regression')
+            threshold: Threshold for binary classification
+            with_proba: Whether to use predict_proba for classifiers
+            data_digest: Precomputed digest of X_test (computed if None)
+            
+        Returns:
+            Tuple of (predictions, positive-class or class probabilities or None)
+        """
+        # Reuse predictions for a model already run on the same test data;
+        # the model is keyed on its fitted state, so refitting it in place
+        # invalidates its entries
+        model_digest = self._model_digest(model)
+        if model_digest is not None:
+            if data_digest is None:
+                data_digest = self._data_digest(X_test)
+            key = (model_digest, data_digest, task_type, threshold, with_proba)
+            with self._prediction_cache_lock:
+                cached = self._prediction_cache.get(key)
+                if cached is not None:
+                    self._prediction_cache.move_to_end(key)
+                    return cached
+        
+        # X_test goes to the model untouched; sparse input must not be densified
+        logger.info(
+            f"Predicting on {'sparse' if sp.issparse(X_test) else 'dense'} "
+            f"{type(X_test).__name__} of shape {X_test.shape}"
+        )
+        y_pred, y_prob = self._run_model(model, X_test, task_type, threshold, with_proba)
+        
+        # Hand metric functions contiguous arrays so they skip conversion copies
+        y_pred = np.ascontiguousarray(y_pred)
+        if y_prob is not None:
+            y_prob = np.ascontiguousarray(y_prob)
+        
+        if model_digest is not None:
+            with self._prediction_cache_lock:
+                self._prediction_cache[key] = (y_pred, y_prob)
+                if len(self._prediction_cache) > self.prediction_cache_size:
+                    self._prediction_cache.popitem(last=False)
+        
+        return y_pred, y_prob
+    
+    @staticmethod
+    def _model_digest(model: Any) -> Optional[str]:
+        """
+        Compute a digest of a model's fitted state.
+        
+        Keras models are hashed through their architecture and weights;
+        other models through their pickled parameters and fitted attributes.
+        
+        Args:
+            model: Trained model
+            
+        Returns:
+            Hex digest, or None if the model cannot be hashed (not cached)
+        """
+        try:
+            if hasattr(model, "get_weights") and hasattr(model, "to_json"):
+                return joblib_hash((model.to_json(), model.get_weights()))
+            return joblib_hash(model)
+        except Exception as e:
+            logger.warning(f"Not caching predictions of unhashable {type(model).__name__}: {e}")
+            return None
+    
+    @staticmethod
+    def _data_digest(X: Union[np.ndarray, pd.DataFrame, sp.spmatrix]) -> bytes:
+        """
+        Compute a content digest of a feature matrix without densifying it.
+        
+        Args:
+            X: Feature matrix
+            
+        Returns:
+            16-byte digest of the values, shape and layout
+        """
+        if sp.issparse(X):
+            X_csr = X.tocsr()
+            parts = (X_csr.data, X_csr.indices, X_csr.indptr)
+        elif isinstance(X, pd.DataFrame):
+            parts = (pd.util.hash_pandas_object(X, index=False).to_numpy(),)
+        else:
+            data = np.asarray(X)
+            if data.dtype == object:
+                # Object arrays hold pointers, not values; hash them through pandas
+                frame = pd.DataFrame(data.reshape(len(data), -1) if data.ndim > 1 else data)
+                parts = (pd.util.hash_pandas_object(frame, index=False).to_numpy(),)
+            else:
+                # Column-major arrays are hashed through their C-contiguous transpose
+                if data.flags.f_contiguous and not data.flags.c_contiguous:
+                    data = data.T
+                parts = (np.ascontiguousarray(data),)
+        
+        digest = blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part)
+        layout = (type(X).__name__, np.shape(X), [part.dtype.str for part in parts])
+        digest.update(repr(layout).encode())
+        return digest.digest()
+    
+    def _run_model(
+        self,
+        model: Any,
+        X_test: Union[np.ndarray, pd.DataFrame, sp.spmatrix],
+        task_type: str,
+        threshold: float,
+        with_proba: bool,
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Run a model over the test features without consulting the cache.
+        
+        Args:
+            model: Trained model
+            X_test: Test features
+            task_type: Type of task ('classification' or 'regression')
+            threshold: Threshold for binary classification
+            with_proba: Whether to use predict_proba for classifiers
+            
+        Returns:
+            Tuple of (predictions, positive-class or class probabilities or None)
+        """
+        if task_type != "classification" or not with_proba:
+            return model.predict(X_test), None
+        
+        try:
+            # For models with predict_proba method (most sklearn models)
+            y_prob = model.predict_proba(X_test)
+            if y_prob.shape[1] == 2:  # Binary classification
+                # Probability of positive class, copied out of the strided column once
+                y_prob = np.ascontiguousarray(y_prob[:, 1])
+                # Reinterpret the boolean comparison as int8 labels without a copy
+                y_pred = np.greater_equal(y_prob, threshold).view(np.int8)
+            else:  # Multi-class
+                y_pred = np.argmax(y_prob, axis=1)
+        except (AttributeError, NotImplementedError):
+            # For models without predict_proba
+            y_pred = model.predict(X_test)
+            y_prob = None
+        
+        return y_pred, y_prob
+    
+    def _classification_metrics(
+        self,
+        y_true: Union[np.ndarray, pd.Series],
+        y_pred: np.ndarray,
+        y_prob: Optional[np.ndarray],
+        n_classes: int,
+    ) -> Tuple[Dict[str, Any], np.ndarray]:
+        """
+        Calculate classification metrics from predictions.
+        
+        Args:
+            y_true: True labels
+            y_pred: Predicted labels
+            y_prob: Predicted probabilities (positive class for binary tasks)
+            n_classes: Number of classes in the true labels
+            
+        Returns:
+            Tuple of (metrics, confusion matrix)
+        """
+        # One confusion matrix and one per-class pass instead of rescanning
+        # the labels for every metric
+        labels = np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))
+        cm = self._confusion_matrix(y_true, y_pred, labels)
+        precision, recall, f1, support = precision_recall_fscore_support(
+            y_true, y_pred, labels=labels, average=None, zero_division=0
+        )
+        
+        metrics = {}
+        metrics["accuracy"] = np.trace(cm) / cm.sum()
+        
+        # Binary classification specific metrics
+        if n_classes == 2:
+            # Report the positive class like sklearn's default pos_label=1;
+            # label pairs without a 1 (e.g. strings) use the larger label
+            numeric = labels.dtype.kind in "biuf"
+            if numeric and 1 in labels:
+                positive = int(np.searchsorted(labels, 1))
+            elif numeric and labels.size < 2:
+                positive = None
+            else:
+                positive = labels.size - 1
+            
+            if positive is None:
+                metrics["precision"] = metrics["recall"] = metrics["f1"] = 0.0
+            else:
+                metrics["precision"] = precision[positive]
+                metrics["recall"] = recall[positive]
+                metrics["f1"] = f1[positive]
+            
+            if y_prob is not None:
+                metrics["roc_auc"] = roc_auc_score(y_true, y_prob)
+                metrics["average_precision"] = average_precision_score(y_true, y_prob)
+        
+        # Multi-class metrics
+        else:
+            metrics["precision_macro"] = precision.mean()
+            metrics["recall_macro"] = recall.mean()
+            metrics["f1_macro"] = f1.mean()
+            
+            # Per-class metrics, laid out like sklearn's classification_report
+            class_report = {
+                str(label): {
+                    "precision": precision[i],
+                    "recall": recall[i],
+                    "f1-score": f1[i],
+                    "support": int(support[i]),
+                }
+                for i, label in enumerate(labels)
+            }
+            class_report["accuracy"] = metrics["accuracy"]
+            class_report["macro avg"] = {
+                "precision": metrics["precision_macro"],
+                "recall": metrics["recall_macro"],
+                "f1-score": metrics["f1_macro"],
+                "support": int(support.sum()),
+            }
+            class_report["weighted avg"] = {
+                "precision": np.average(precision, weights=support),
+                "recall": np.average(recall, weights=support),
+                "f1-score": np.average(f1, weights=support),
+                "support": int(support.sum()),
+            }
+            metrics["classification_report"] = class_report
+        
+        return metrics, cm
+    
+    def _regression_metrics(
+        self,
+        y_true: Union[np.ndarray, pd.Series],
+        y_pred: np.ndarray,
+    ) -> Dict[str, Any]:
+        """
+        Calculate regression metrics from predictions.
+        
+        Args:
+            y_true: True values
+            y_pred: Predicted values
+            
+        Returns:
+            Dictionary of regression metrics
+        """
+        metrics = {}
+        metrics["mse"] = mean_squared_error(y_true, y_pred)
+        metrics["rmse"] = np.sqrt(metrics["mse"])
+        metrics["mae"] = mean_absolute_error(y_true, y_pred)
+        metrics["r2"] = r2_score(y_true, y_pred)
+        
+        # Calculate additional metrics, reusing one absolute-error buffer
+        y_true_values = np.asarray(y_true, dtype=np.float64)
+        abs_error = np.subtract(y_true_values, y_pred, dtype=np.float64)
+        np.abs(abs_error, out=abs_error)
+        denom = np.abs(y_true_values)
+        np.maximum(denom, 1e-10, out=denom)
+        
+        np.divide(abs_error, denom, out=denom)
+        metrics["mean_absolute_percentage_error"] = denom.mean() * 100
+        
+        # The error buffer is no longer needed, so select the median in place
+        # (O(N)) instead of letting np.median copy it first
+        k = abs_error.size // 2
+        if abs_error.size % 2:
+            abs_error.partition(k)
+            metrics["median_absolute_error"] = abs_error[k]
+        else:
+            abs_error.partition((k - 1, k))
+            metrics["median_absolute_error"] = (abs_error[k - 1] + abs_error[k]) / 2
+        
+        return metrics
+    
+    @staticmethod
+    def _confusion_matrix(
+        y_true: Union[np.ndarray, pd.Series],
+        y_pred: np.ndarray,
+        labels: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Compute a confusion matrix, counting directly for 0..n-1 integer labels.
+        
+        Args:
+            y_true: True labels
+            y_pred: Predicted labels
+            labels: Sorted unique labels of y_true and y_pred
+            
+        Returns:
+            Confusion matrix with rows for true and columns for predicted labels
+        """
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        n = len(labels)
+        
+        # Labels are exactly 0..n-1, so each (true, pred) pair maps to one bin
+        if (
+            y_true.dtype.kind in "iu"
+            and y_pred.dtype.kind in "iu"
+            and labels[0] == 0
+            and labels[-1] == n - 1
+        ):
+            bins = y_true.astype(np.int64) * n + y_pred
+            return np.bincount(bins, minlength=n * n).reshape(n, n)
+        
+        return confusion_matrix(y_true, y_pred, labels=labels)
+    
+    @_cached_plot("confusion_matrix")
     def _plot_confusion_matrix(
         self,
         y_true: Union[np.ndarray, pd.Series],
         y_pred: np.ndarray,
         class_names: List[str],
+        cm: Optional[np.ndarray] = None,
+        timestamp: Optional[str] = None,
     ) -> str:
         """
         Generate and save a confusion matrix plot.
@@ -236,37 +663,58 @@ class ModelEvaluator:
             y_true: True labels
             y_pred: Predicted labels
             class_names: Names of classes
+            cm: Precomputed confusion matrix (computed from the labels if None)
+            timestamp: Timestamp for the file name (current time if None)
             
         Returns:
             Path to the saved plot
         """
-        cm = confusion_matrix(y_true, y_pred)
+        if cm is None:
+            labels = np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))
+            cm = self._confusion_matrix(y_true, y_pred, labels)
         
-        plt.figure(figsize=(10, 8))
+        import seaborn as sns
+        
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(10, 8))
         sns.heatmap(
             cm,
-            annot=True,
-            fmt="d",
+            annot=False,
             cmap="Blues",
             xticklabels=class_names,
             yticklabels=class_names,
+            ax=ax,
         )
-        plt.ylabel("True Label")
-        plt.xlabel("Predicted Label")
-        plt.title("Confusion Matrix")
+        
+        # Annotate only non-zero cells; off-diagonal cells are mostly empty
+        threshold = cm.max() / 2
+        for i, j in np.argwhere(cm > 0):
+            ax.text(
+                j + 0.5,
+                i + 0.5,
+                str(cm[i, j]),
+                ha="center",
+                va="center",
+                color="white" if cm[i, j] > threshold else "black",
+            )
+        ax.set_ylabel("True Label")
+        ax.set_xlabel("Predicted Label")
+        ax.set_title("Confusion Matrix")
         
         # Save the plot
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         plot_path = os.path.join(self.output_dir, f"confusion_matrix_{timestamp}.png")
-        plt.savefig(plot_path, bbox_inches="tight")
-        plt.close()
+        fig.savefig(plot_path, bbox_inches="tight")
+        plt.close(fig)
         
         return plot_path
     
+    @_cached_plot("roc_curve")
     def _plot_roc_curve(
         self,
         y_true: Union[np.ndarray, pd.Series],
         y_prob: np.ndarray,
+        timestamp: Optional[str] = None,
     ) -> str:
         """
         Generate and save a ROC curve plot.
@@ -274,37 +722,43 @@ class ModelEvaluator:
         Args:
             y_true: True labels
             y_prob: Predicted probabilities
+            timestamp: Timestamp for the file name (current time if None)
             
         Returns:
             Path to the saved plot
         """
         fpr, tpr, thresholds = roc_curve(y_true, y_prob)
-        roc_auc = roc_auc_score(y_true, y_prob)
         
-        plt.figure(figsize=(10, 8))
-        plt.plot(
+        # Integrate the curve already computed instead of re-sorting the scores
+        roc_auc = auc(fpr, tpr)
+        
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(10, 8))
+        ax.plot(
             fpr, tpr, color="darkorange", lw=2, label=f"ROC curve (AUC = {roc_auc:.3f})"
         )
-        plt.plot([0, 1], [0, 1], color="navy", lw=2, linestyle="--")
-        plt.xlim([0.0, 1.0])
-        plt.ylim([0.0, 1.05])
-        plt.xlabel("False Positive Rate")
-        plt.ylabel("True Positive Rate")
-        plt.title("Receiver Operating Characteristic (ROC) Curve")
-        plt.legend(loc="lower right")
+        ax.plot([0, 1], [0, 1], color="navy", lw=2, linestyle="--")
+        ax.set_xlim([0.0, 1.0])
+        ax.set_ylim([0.0, 1.05])
+        ax.set_xlabel("False Positive Rate")
+        ax.set_ylabel("True Positive Rate")
+        ax.set_title("Receiver Operating Characteristic (ROC) Curve")
+        ax.legend(loc="lower right")
         
         # Save the plot
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         plot_path = os.path.join(self.output_dir, f"roc_curve_{timestamp}.png")
-        plt.savefig(plot_path, bbox_inches="tight")
-        plt.close()
+        fig.savefig(plot_path, bbox_inches="tight")
+        plt.close(fig)
         
         return plot_path
     
+    @_cached_plot("precision_recall_curve")
     def _plot_precision_recall_curve(
         self,
         y_true: Union[np.ndarray, pd.Series],
         y_prob: np.ndarray,
+        timestamp: Optional[str] = None,
     ) -> str:
         """
         Generate and save a precision-recall curve plot.
@@ -312,40 +766,63 @@ class ModelEvaluator:
         Args:
             y_true: True labels
             y_prob: Predicted probabilities
+            timestamp: Timestamp for the file name (current time if None)
             
         Returns:
             Path to the saved plot
         """
         precision, recall, thresholds = precision_recall_curve(y_true, y_prob)
-        average_precision = average_precision_score(y_true, y_prob)
         
-        plt.figure(figsize=(10, 8))
-        plt.plot(
+        # Step-wise area under the computed curve, as average_precision_score does
+        average_precision = -np.sum(np.diff(recall) * precision[:-1])
+        
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(10, 8))
+        ax.plot(
             recall,
             precision,
             color="blue",
             lw=2,
             label=f"Precision-Recall curve (AP = {average_precision:.3f})",
         )
-        plt.xlabel("Recall")
-        plt.ylabel("Precision")
-        plt.ylim([0.0, 1.05])
-        plt.xlim([0.0, 1.0])
-        plt.title("Precision-Recall Curve")
-        plt.legend(loc="lower left")
+        ax.set_xlabel("Recall")
+        ax.set_ylabel("Precision")
+        ax.set_ylim([0.0, 1.05])
+        ax.set_xlim([0.0, 1.0])
+        ax.set_title("Precision-Recall Curve")
+        ax.legend(loc="lower left")
         
         # Save the plot
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         plot_path = os.path.join(self.output_dir, f"precision_recall_curve_{timestamp}.png")
-        plt.savefig(plot_path, bbox_inches="tight")
-        plt.close()
+        fig.savefig(plot_path, bbox_inches="tight")
+        plt.close(fig)
         
         return plot_path
     
+    @staticmethod
+    def _scatter_sample(n: int) -> Union[slice, np.ndarray]:
+        """
+        Choose which points to draw in a scatter plot.
+        
+        Args:
+            n: Number of available points
+            
+        Returns:
+            Index selecting at most MAX_SCATTER_POINTS points, in order
+        """
+        if n <= MAX_SCATTER_POINTS:
+            return slice(None)
+        
+        rng = np.random.default_rng(0)
+        return np.sort(rng.choice(n, MAX_SCATTER_POINTS, replace=False))
+    
+    @_cached_plot("actual_vs_predicted")
     def _plot_actual_vs_predicted(
         self,
         y_true: Union[np.ndarray, pd.Series],
         y_pred: np.ndarray,
+        timestamp: Optional[str] = None,
     ) -> str:
         """
         Generate and save an actual vs predicted values plot.
@@ -353,38 +830,46 @@ class ModelEvaluator:
         Args:
             y_true: True values
             y_pred: Predicted values
+            timestamp: Timestamp for the file name (current time if None)
             
         Returns:
             Path to the saved plot
         """
-        plt.figure(figsize=(10, 8))
-        plt.scatter(y_true, y_pred, alpha=0.5)
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(10, 8))
+        idx = self._scatter_sample(len(y_true))
+        ax.scatter(y_true[idx], y_pred[idx], alpha=0.5)
         
         # Plot the perfect prediction line
         min_val = min(np.min(y_true), np.min(y_pred))
         max_val = max(np.max(y_true), np.max(y_pred))
-        plt.plot([min_val, max_val], [min_val, max_val], "r--", lw=2)
+        ax.plot([min_val, max_val], [min_val, max_val], "r--", lw=2)
         
-        plt.xlabel("Actual Values")
-        plt.ylabel("Predicted Values")
-        plt.title("Actual vs Predicted Values")
+        ax.set_xlabel("Actual Values")
+        ax.set_ylabel("Predicted Values")
+        ax.set_title("Actual vs Predicted Values")
         
         # Add R² value to the plot
         r2 = r2_score(y_true, y_pred)
-        plt.annotate(f"R² = {r2:.3f}", xy=(0.05, 0.95), xycoords="axes fraction")
+        ax.annotate(f"R² = {r2:.3f}", xy=(0.05, 0.95), xycoords="axes fraction")
         
         # Save the plot
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         plot_path = os.path.join(self.output_dir, f"actual_vs_predicted_{timestamp}.png")
-        plt.savefig(plot_path, bbox_inches="tight")
-        plt.close()
+        fig.savefig(plot_path, bbox_inches="tight")
+        plt.close(fig)
         
         return plot_path
     
+    @_cached_plot("residuals")
     def _plot_residuals(
         self,
         y_true: Union[np.ndarray, pd.Series],
         y_pred: np.ndarray,
+        timestamp: Optional[str] = None,
     ) -> str:
         """
         Generate and save a residual plot.
@@ -392,65 +877,75 @@ class ModelEvaluator:
         Args:
             y_true: True values
             y_pred: Predicted values
+            timestamp: Timestamp for the file name (current time if None)
             
         Returns:
             Path to the saved plot
         """
-        residuals = y_true - y_pred
+        y_pred = np.asarray(y_pred)
+        idx = self._scatter_sample(len(y_pred))
+        residuals = np.asarray(y_true)[idx] - y_pred[idx]
         
-        plt.figure(figsize=(10, 8))
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(10, 8))
         
         # Scatter plot of predicted values vs residuals
-        plt.scatter(y_pred, residuals, alpha=0.5)
-        plt.axhline(y=0, color="r", linestyle="--", lw=2)
+        ax.scatter(y_pred[idx], residuals, alpha=0.5)
+        ax.axhline(y=0, color="r", linestyle="--", lw=2)
         
-        plt.xlabel("Predicted Values")
-        plt.ylabel("Residuals")
-        plt.title("Residual Plot")
+        ax.set_xlabel("Predicted Values")
+        ax.set_ylabel("Residuals")
+        ax.set_title("Residual Plot")
         
         # Save the plot
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         plot_path = os.path.join(self.output_dir, f"residuals_{timestamp}.png")
-        plt.savefig(plot_path, bbox_inches="tight")
-        plt.close()
+        fig.savefig(plot_path, bbox_inches="tight")
+        plt.close(fig)
         
         return plot_path
     
     def compare_models(
         self,
         models: Dict[str, Any],
-        X_test: Union[np.ndarray, pd.DataFrame],
+        X_test: Union[np.ndarray, pd.DataFrame, sp.spmatrix],
         y_test: Union[np.ndarray, pd.Series],
         task_type: str = "classification",
+        n_jobs: int = -1,
     ) -> Dict[str, Any]:
         """
         Compare multiple models on the same test data.
         
+        Models are evaluated concurrently on a thread pool; most estimators
+        release the GIL inside predict, and the prediction cache stays shared.
+        
         Args:
             models: Dictionary of model names to model objects
             X_test: Test features
             y_test: True labels/values
             task_type: Type of task ('classification' or 'regression')
+            n_jobs: Number of models to evaluate in parallel (-1 for all cores)
             
         Returns:
             Dictionary of comparison results and plots
         """
         logger.info(f"Comparing {len(models)} models on {task_type} task")
+        y_test = np.ascontiguousarray(y_test)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        results = {}
-        metrics_comparison = {}
+        n_classes = self._count_classes(y_test) if task_type == "classification" else None
+        data_digest = self._data_digest(X_test)
         
-        for name, model in models.items():
-            logger.info(f"Evaluating model: {name}")
-            
-            if task_type == "classification":
-                model_results = self.evaluate_classifier(model, X_test, y_test)
-                metrics_comparison[name] = model_results["metrics"]
-            else:
-                model_results = self.evaluate_regressor(model, X_test, y_test)
-                metrics_comparison[name] = model_results["metrics"]
-            
-            results[name] = model_results
+        # Predict once per model and compute metrics in-process; per-model
+        # plots and JSON files are skipped in favour of the comparison artifacts
+        all_metrics = Parallel(n_jobs=n_jobs, backend="threading")(
+            delayed(self._evaluate_one)(
+                name, model, X_test, y_test, task_type, n_classes, data_digest
+            )
+            for name, model in models.items()
+        )
+        metrics_comparison = dict(zip(models, all_metrics))
+        results = {name: {"metrics": metrics} for name, metrics in metrics_comparison.items()}
         
         # Create comparison plots
         plots = {}
@@ -462,26 +957,16 @@ class ModelEvaluator:
             else ["mse", "mae", "r2"]
         )
         
-        plots["metrics_comparison"] = self._plot_metrics_comparison(
-            metrics_comparison, key_metrics
-        )
+        if self.enable_plots:
+            plots["metrics_comparison"] = self._plot_metrics_comparison(
+                metrics_comparison, key_metrics, timestamp=timestamp
+            )
         
         # Save comparison results
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
         comparison_path = os.path.join(
             self.output_dir, f"model_comparison_{timestamp}.json"
         )
-        
-        # Extract only serializable metrics
-        serializable_metrics = {}
-        for model_name, model_metrics in metrics_comparison.items():
-            serializable_metrics[model_name] = {
-                k: v for k, v in model_metrics.items() 
-                if isinstance(v, (int, float, str, list))
-            }
-        
-        with open(comparison_path, "w") as f:
-            json.dump(serializable_metrics, f, indent=2)
+        self._write_json(comparison_path, metrics_comparison)
         
         return {
             "model_results": results,
@@ -489,10 +974,49 @@ class ModelEvaluator:
             "comparison_file": comparison_path,
         }
     
+    def _evaluate_one(
+        self,
+        name: str,
+        model: Any,
+        X_test: Union[np.ndarray, pd.DataFrame, sp.spmatrix],
+        y_test: Union[np.ndarray, pd.Series],
+        task_type: str,
+        n_classes: Optional[int],
+        data_digest: bytes,
+    ) -> Dict[str, Any]:
+        """
+        Compute the metrics of one model for a comparison.
+        
+        Args:
+            name: Name of the model
+            model: Trained model
+            X_test: Test features
+            y_test: True labels/values
+            task_type: Type of task ('classification' or 'regression')
+            n_classes: Number of classes for classification tasks
+            data_digest: Digest of X_test
+            
+        Returns:
+            Dictionary of model metrics
+        """
+        logger.info(f"Evaluating model: {name}")
+        
+        y_pred, y_prob = self._predict_once(
+            model, X_test, task_type, with_proba=n_classes == 2, data_digest=data_digest
+        )
+        if task_type == "classification":
+            metrics, _ = self._classification_metrics(y_test, y_pred, y_prob, n_classes)
+        else:
+            metrics = self._regression_metrics(y_test, y_pred)
+        
+        return metrics
+    
+    @_cached_plot("metrics_comparison")
     def _plot_metrics_comparison(
         self,
         metrics_comparison: Dict[str, Dict[str, float]],
         key_metrics: List[str],
+        timestamp: Optional[str] = None,
     ) -> str:
         """
         Generate and save a bar plot comparing key metrics across models.
@@ -500,47 +1024,39 @@ class ModelEvaluator:
         Args:
             metrics_comparison: Dictionary of model names to metrics
             key_metrics: List of metrics to include in the comparison
+            timestamp: Timestamp for the file name (current time if None)
             
         Returns:
             Path to the saved plot
         """
         # Filter metrics to include only those that exist for all models
-        valid_metrics = []
-        for metric in key_metrics:
-            if all(metric in model_metrics for model_metrics in metrics_comparison.values()):
-                valid_metrics.append(metric)
+        common_metrics = set(key_metrics).intersection(*metrics_comparison.values())
+        valid_metrics = [metric for metric in key_metrics if metric in common_metrics]
         
         if not valid_metrics:
             logger.warning("No common metrics found for comparison")
             return None
         
-        # Create a DataFrame for plotting
-        data = []
-        for model_name, model_metrics in metrics_comparison.items():
-            for metric in valid_metrics:
-                data.append({
-                    "Model": model_name,
-                    "Metric": metric,
-                    "Value": model_metrics[metric],
-                })
-        
-        df = pd.DataFrame(data)
+        # Metric x model table; each cell is already the value of one bar
+        df = pd.DataFrame(metrics_comparison, index=valid_metrics).astype(float)
+        df.columns.name = "Model"
         
         # Create the plot
-        plt.figure(figsize=(12, 8))
-        ax = sns.barplot(x="Metric", y="Value", hue="Model", data=df)
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(12, 8))
+        df.plot.bar(ax=ax)
         
-        plt.title("Model Comparison")
-        plt.xlabel("Metric")
-        plt.ylabel("Value")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.set_title("Model Comparison")
+        ax.set_xlabel("Metric")
+        ax.set_ylabel("Value")
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
         
         # Save the plot
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         plot_path = os.path.join(self.output_dir, f"metrics_comparison_{timestamp}.png")
-        plt.savefig(plot_path, bbox_inches="tight")
-        plt.close()
+        fig.savefig(plot_path, bbox_inches="tight")
+        plt.close(fig)
         
         return plot_path
 
@@ -4,17 +4,33 @@ Model Factory Module
 This module provides a factory for creating different machine learning models.
 """
 
+import functools
 import logging
-from typing import Dict, Any, List, Tuple, Optional, Union, Callable
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Dict, Any, List, NamedTuple, Tuple, Optional, Type, TypeVar, Union, Callable
 
+import joblib
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from tensorflow.keras import layers, models, optimizers
+import psutil
 from sklearn.base import BaseEstimator
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
+from sklearn.ensemble import (
+    GradientBoostingRegressor,
+    HistGradientBoostingRegressor,
+    RandomForestClassifier,
+)
 from sklearn.linear_model import LogisticRegression, LinearRegression
-import xgboost as xgb
+
+# TensorFlow and XGBoost are imported inside the builders that need them so
+# that creating a scikit-learn model does not pay for loading them
+if TYPE_CHECKING:
+    import tensorflow as tf
+    import treelite_runtime
+    import xgboost as xgb
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +39,210 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Optimizer type -> name of the Keras optimizer class
+_OPTIMIZER_CLASSES = {
+    "adam": "Adam",
+    "sgd": "SGD",
+    "rmsprop": "RMSprop",
+}
+
+# Default worker count for scikit-learn estimators: SMT siblings share the
+# core's execution units, so compute-bound fits gain nothing from them
+_PHYSICAL_CORES = psutil.cpu_count(logical=False) or os.cpu_count()
+
+
+def _xgb_cuda_available() -> bool:
+    """
+    Check whether the installed XGBoost build supports CUDA.
+    
+    Returns:
+        True if XGBoost can train on a CUDA device
+    """
+    import xgboost as xgb
+    
+    return bool(xgb.build_info().get("USE_CUDA", False))
+
+
+@dataclass(frozen=True)
+class KerasConfig:
+    """
+    Settings shared by the Keras model builders.
+    
+    The optimizer is excluded from equality and hashing: it only affects
+    compilation, not the architecture.
+    
+    dropout_variant is "spatial" (CNN feature maps drop whole channels with
+    SpatialDropout2D after each conv block), "gaussian" (dense layers use
+    GaussianDropout, a single multiplicative noise op) or "standard".
+    """
+    activation: str = "relu"
+    dropout_rate: float = 0.2
+    dropout_variant: str = "spatial"
+    optimizer: Dict[str, Any] = field(
+        default_factory=lambda: {"type": "adam", "learning_rate": 0.001},
+        compare=False,
+    )
+    precision: str = "float32"
+    strategy: Optional[str] = None
+    jit_compile: bool = True
+    tensorcore_multiple: int = 8
+    
+    def __post_init__(self):
+        if self.dropout_variant not in ("spatial", "gaussian", "standard"):
+            raise ValueError(f"Unsupported dropout variant: {self.dropout_variant}")
+
+
+@dataclass(frozen=True)
+class NNConfig(KerasConfig):
+    """Configuration of a fully connected neural network."""
+    hidden_layers: Tuple[int, ...] = (64, 32)
+
+
+@dataclass(frozen=True)
+class CNNConfig(KerasConfig):
+    """
+    Configuration of a convolutional neural network.
+    
+    With input_dtype "uint8", images are fed as raw [0, 255] bytes and
+    rescaled inside the model, so the input pipeline moves a quarter of the
+    bytes of float32 and XLA fuses the cast into the first convolution.
+    """
+    filters: Tuple[int, ...] = (32, 64, 128)
+    kernel_sizes: Tuple[int, ...] = (3, 3, 3)
+    pool_sizes: Tuple[int, ...] = (2, 2, 2)
+    dense_layers: Tuple[int, ...] = (128,)
+    input_dtype: str = "float32"
+    
+    def __post_init__(self):
+        super().__post_init__()
+        if not len(self.filters) == len(self.kernel_sizes) == len(self.pool_sizes):
+            raise ValueError(
+                "filters, kernel_sizes and pool_sizes must have the same length, got "
+                f"{len(self.filters)}, {len(self.kernel_sizes)} and {len(self.pool_sizes)}"
+            )
+    
+    @property
+    def conv_specs(self) -> List["ConvSpec"]:
+        """Per-block convolution settings, one entry per conv block."""
+        return [ConvSpec(*spec) for spec in zip(self.filters, self.kernel_sizes, self.pool_sizes)]
+
+
+class ConvSpec(NamedTuple):
+    """Settings of one convolutional block."""
+    filters: int
+    kernel: int
+    pool: int
+
+
+@dataclass(frozen=True)
+class LSTMConfig(KerasConfig):
+    """Configuration of an LSTM network for sequence data."""
+    lstm_units: Tuple[int, ...] = (64, 32)
+    dense_layers: Tuple[int, ...] = (32,)
+    unroll: bool = False
+    # Only accepted to warn about them; LSTM layers stay CuDNN-compatible
+    lstm_activation: str = "tanh"
+    recurrent_dropout: float = 0.0
+
+
+@dataclass(frozen=True)
+class XGBConfig:
+    """Configuration of an XGBoost model."""
+    n_estimators: int = 100
+    learning_rate: float = 0.1
+    max_depth: int = 3
+    subsample: float = 1.0
+    colsample_bytree: float = 1.0
+    objective: str = "reg:squarederror"
+    random_state: int = 42
+    n_jobs: int = -1
+    tree_method: str = "hist"
+    max_bin: int = 256
+    grow_policy: str = "depthwise"
+    use_gpu: bool = False
+    n_samples: Optional[int] = None
+    task_type: Optional[str] = None
+    num_classes: int = 2
+
+
+ConfigT = TypeVar("ConfigT")
+
+
+def _coerce_config(config_class: Type[ConfigT], config: Union[Dict[str, Any], ConfigT]) -> ConfigT:
+    """
+    Validate a configuration dictionary into a config dataclass.
+    
+    Lists are converted to tuples so the result stays hashable. Unknown keys
+    are logged and ignored, as they were when builders read the dictionary
+    with .get().
+    
+    Args:
+        config_class: Config dataclass to build
+        config: Configuration dictionary, or an instance of config_class
+        
+    Returns:
+        Config dataclass instance
+    """
+    if isinstance(config, config_class):
+        return config
+    
+    names = {f.name for f in fields(config_class)}
+    unknown = sorted(k for k in config if k not in names)
+    if unknown:
+        logger.warning(f"Ignoring unknown {config_class.__name__} keys: {', '.join(unknown)}")
+    
+    values = {
+        k: tuple(v) if isinstance(v, list) else v
+        for k, v in config.items()
+        if k in names
+    }
+    return config_class(**values)
+
+
+@functools.lru_cache(maxsize=64)
+def _keras_template(
+    build: Callable[..., "tf.keras.Model"],
+    cfg: KerasConfig,
+    input_shape: Tuple,
+    num_classes: Optional[int],
+) -> "tf.keras.Model":
+    """
+    Build and cache the uncompiled reference model for an architecture.
+    
+    Args:
+        build: Builder returning the uncompiled model for cfg
+        cfg: Keras model configuration
+        input_shape: Shape of model inputs
+        num_classes: Number of output classes (None for regression)
+        
+    Returns:
+        Uncompiled Keras model, to be cloned rather than trained
+    """
+    return build(cfg, input_shape, num_classes)
+
+
+@functools.lru_cache(maxsize=None)
+def _distribution_strategy(name: str) -> "tf.distribute.Strategy":
+    """
+    Create a tf.distribute strategy once per process.
+    
+    Args:
+        name: "mirrored", "multi_worker" or "one_device"
+        
+    Returns:
+        Distribution strategy shared by every model built under it
+    """
+    import tensorflow as tf
+    
+    if name == "mirrored":
+        return tf.distribute.MirroredStrategy()
+    if name == "multi_worker":
+        return tf.distribute.MultiWorkerMirroredStrategy()
+    if name == "one_device":
+        devices = tf.config.list_logical_devices("GPU") or tf.config.list_logical_devices("CPU")
+        return tf.distribute.OneDeviceStrategy(devices[0].name)
+    raise ValueError(f"Unsupported distribution strategy: {name}")
+
 
 class ModelFactory:
     """Factory for creating different types of machine learning models."""
@@ -33,7 +253,7 @@ class ModelFactory:
         model_config: Dict[str, Any],
         input_shape: Optional[Tuple] = None,
         num_classes: Optional[int] = None
-    ) -> Union[BaseEstimator, tf.keras.Model]:
+    ) -> Union[BaseEstimator, "tf.keras.Model"]:
         """
         Create a model based on the specified type and configuration.
         
@@ -46,24 +266,12 @@ class ModelFactory:
         Returns:
             A machine learning model instance
         """
-        if model_type == "random_forest":
-            return ModelFactory.create_random_forest(model_config)
-        elif model_type == "logistic_regression":
-            return ModelFactory.create_logistic_regression(model_config)
-        elif model_type == "linear_regression":
-            return ModelFactory.create_linear_regression(model_config)
-        elif model_type == "gradient_boosting":
-            return ModelFactory.create_gradient_boosting(model_config)
-        elif model_type == "xgboost":
-            return ModelFactory.create_xgboost(model_config)
-        elif model_type == "neural_network":
-            return ModelFactory.create_neural_network(model_config, input_shape, num_classes)
-        elif model_type == "cnn":
-            return ModelFactory.create_cnn(model_config, input_shape, num_classes)
-        elif model_type == "lstm":
-            return ModelFactory.create_lstm(model_config, input_shape, num_classes)
-        else:
-            raise ValueError(f"Unsupported model type: {model_type}")
+        try:
+            builder = _MODEL_BUILDERS[model_type]
+        except KeyError:
+            raise ValueError(f"Unsupported model type: {model_type}") from None
+        
+        return builder(model_config, input_shape, num_classes)
     
     @staticmethod
     def create_random_forest(config: Dict[str, Any]) -> RandomForestClassifier:
@@ -82,7 +290,8 @@ class ModelFactory:
             "min_samples_split": config.get("min_samples_split", 2),
             "min_samples_leaf": config.get("min_samples_leaf", 1),
             "random_state": config.get("random_state", 42),
-            "n_jobs": config.get("n_jobs", -1),
+            "n_jobs": config.get("n_jobs", _PHYSICAL_CORES),
+            "oob_score": config.get("oob_score", False),
         }
         
         # Remove None values
@@ -108,7 +317,7 @@ class ModelFactory:
             "solver": config.get("solver", "lbfgs"),
             "max_iter": config.get("max_iter", 100),
             "random_state": config.get("random_state", 42),
-            "n_jobs": config.get("n_jobs", -1),
+            "n_jobs": config.get("n_jobs", _PHYSICAL_CORES),
         }
         
         logger.info(f"Creating LogisticRegression with params: {params}")
@@ -127,29 +336,68 @@ class ModelFactory:
         """
         params = {
             "fit_intercept": config.get("fit_intercept", True),
-            "n_jobs": config.get("n_jobs", -1),
+            "n_jobs": config.get("n_jobs", _PHYSICAL_CORES),
         }
         
         logger.info(f"Creating LinearRegression with params: {params}")
         return LinearRegression(**params)
     
     @staticmethod
-    def create_gradient_boosting(config: Dict[str, Any]) -> GradientBoostingRegressor:
+    def create_gradient_boosting(
+        config: Dict[str, Any]
+    ) -> Union[HistGradientBoostingRegressor, GradientBoostingRegressor]:
         """
         Create a gradient boosting regressor.
         
+        The default "hist" grower bins features into at most max_bin buckets
+        and builds trees from per-bin histograms, which is much faster than
+        the exact grower on large datasets. Unlike the legacy
+        GradientBoostingRegressor (grower "exact"), it does not support
+        subsample or min_samples_split and has no feature_importances_; use
+        permutation importance instead. Configs that set an exact-only
+        parameter without choosing a grower get the exact grower.
+        
         Args:
             config: Model configuration
             
         Returns:
-            GradientBoostingRegressor instance
+            HistGradientBoostingRegressor or GradientBoostingRegressor instance
         """
+        exact_only = [name for name in ("subsample", "min_samples_split") if name in config]
+        grower = config.get("grower")
+        if grower is None:
+            grower = "exact" if exact_only else "hist"
+            if exact_only:
+                logger.warning(
+                    f"Using the exact gradient boosting grower for {', '.join(exact_only)}"
+                )
+        elif grower == "hist" and exact_only:
+            logger.warning(
+                f"Ignoring {', '.join(exact_only)}, not supported by the hist grower"
+            )
+        
+        if grower == "hist":
+            params = {
+                "max_iter": config.get("n_estimators", 100),
+                "learning_rate": config.get("learning_rate", 0.1),
+                "max_depth": config.get("max_depth", 3),
+                "min_samples_leaf": config.get("min_samples_leaf", 1),
+                "max_bins": config.get("max_bin", 255),
+                "random_state": config.get("random_state", 42),
+            }
+            
+            logger.info(f"Creating HistGradientBoostingRegressor with params: {params}")
+            return HistGradientBoostingRegressor(**params)
+        if grower != "exact":
+            raise ValueError(f"Unsupported gradient boosting grower: {grower}")
+        
         params = {
             "n_estimators": config.get("n_estimators", 100),
             "learning_rate": config.get("learning_rate", 0.1),
             "max_depth": config.get("max_depth", 3),
             "min_samples_split": config.get("min_samples_split", 2),
             "min_samples_leaf": config.get("min_samples_leaf", 1),
+            "subsample": config.get("subsample", 1.0),
             "random_state": config.get("random_state", 42),
         }
         
@@ -157,31 +405,53 @@ class ModelFactory:
         return GradientBoostingRegressor(**params)
     
     @staticmethod
-    def create_xgboost(config: Dict[str, Any]) -> xgb.XGBModel:
+    def create_xgboost(config: Union[Dict[str, Any], XGBConfig]) -> "xgb.XGBModel":
         """
         Create an XGBoost model.
         
+        The returned estimator accepts scipy.sparse CSR/CSC matrices in fit
+        and predict without densifying them: the hist grower only visits
+        stored entries, which for one-hot encoded features is most of the
+        speedup, so pass sparse inputs through unconverted. Absent entries
+        are treated as missing values rather than zeros.
+        
         Args:
             config: Model configuration
             
         Returns:
             XGBoost model instance
         """
+        import xgboost as xgb
+        
+        cfg = _coerce_config(XGBConfig, config)
         params = {
-            "n_estimators": config.get("n_estimators", 100),
-            "learning_rate": config.get("learning_rate", 0.1),
-            "max_depth": config.get("max_depth", 3),
-            "subsample": config.get("subsample", 1.0),
-            "colsample_bytree": config.get("colsample_bytree", 1.0),
-            "objective": config.get("objective", "reg:squarederror"),
-            "random_state": config.get("random_state", 42),
-            "n_jobs": config.get("n_jobs", -1),
+            "n_estimators": cfg.n_estimators,
+            "learning_rate": cfg.learning_rate,
+            "max_depth": cfg.max_depth,
+            "subsample": cfg.subsample,
+            "colsample_bytree": cfg.colsample_bytree,
+            "objective": cfg.objective,
+            "random_state": cfg.random_state,
+            "n_jobs": cfg.n_jobs,
+            # Histogram grower over quantized feature bins instead of exact splits
+            "tree_method": cfg.tree_method,
+            "max_bin": cfg.max_bin,
+            "grow_policy": cfg.grow_policy,
         }
         
-        if config.get("task_type") == "classification":
-            if config.get("num_classes", 2) > 2:
+        if cfg.use_gpu:
+            if _xgb_cuda_available():
+                params["device"] = "cuda"
+                params.pop("n_jobs")  # Ignored on GPU
+                if cfg.n_samples is not None and cfg.n_samples < 10_000:
+                    logger.warning("CPU hist is usually faster than CUDA for small datasets")
+            else:
+                logger.warning("use_gpu requested but XGBoost was built without CUDA; using CPU")
+        
+        if cfg.task_type == "classification":
+            if cfg.num_classes > 2:
                 params["objective"] = "multi:softprob"
-                params["num_class"] = config.get("num_classes")
+                params["num_class"] = cfg.num_classes
             else:
                 params["objective"] = "binary:logistic"
                 
@@ -193,10 +463,10 @@ class ModelFactory:
     
     @staticmethod
     def create_neural_network(
-        config: Dict[str, Any],
+        config: Union[Dict[str, Any], NNConfig],
         input_shape: Tuple,
         num_classes: Optional[int] = None
-    ) -> tf.keras.Model:
+    ) -> "tf.keras.Model":
         """
         Create a simple neural network.
         
@@ -211,72 +481,58 @@ class ModelFactory:
         if input_shape is None:
             raise ValueError("input_shape must be provided for neural networks")
         
-        hidden_layers = config.get("hidden_layers", [64, 32])
-        activation = config.get("activation", "relu")
-        dropout_rate = config.get("dropout_rate", 0.2)
+        cfg = _coerce_config(NNConfig, config)
+        ModelFactory._apply_precision_policy(cfg)
         
-        model = models.Sequential()
+        model = ModelFactory._from_template(
+            ModelFactory._build_neural_network, cfg, input_shape, num_classes
+        )
         
-        # Input layer
-        model.add(layers.InputLayer(input_shape=input_shape))
-        
-        # Hidden layers
-        for units in hidden_layers:
-            model.add(layers.Dense(units, activation=activation))
-            if dropout_rate > 0:
-                model.add(layers.Dropout(dropout_rate))
-        
-        # Output layer
-        if num_classes is not None:
-            if num_classes == 2:
-                model.add(layers.Dense(1, activation="sigmoid"))
-            else:
-                model.add(layers.Dense(num_classes, activation="softmax"))
-        else:
-            model.add(layers.Dense(1))  # Regression
+        logger.info(f"Created neural network with {len(cfg.hidden_layers)} hidden layers")
+        return model
+    
+    @staticmethod
+    def _build_neural_network(
+        cfg: NNConfig,
+        input_shape: Tuple,
+        num_classes: Optional[int]
+    ) -> "tf.keras.Model":
+        """
+        Build the uncompiled graph of a simple neural network.
         
-        # Compile model
-        optimizer_config = config.get("optimizer", {"type": "adam", "learning_rate": 0.001})
-        optimizer_type = optimizer_config.get("type", "adam")
-        learning_rate = optimizer_config.get("learning_rate", 0.001)
-        
-        if optimizer_type == "adam":
-            optimizer = optimizers.Adam(learning_rate=learning_rate)
-        elif optimizer_type == "sgd":
-            optimizer = optimizers.SGD(learning_rate=learning_rate)
-        elif optimizer_type == "rmsprop":
-            optimizer = optimizers.RMSprop(learning_rate=learning_rate)
-        else:
-            raise ValueError(f"Unsupported optimizer: {optimizer_type}")
+        Args:
+            cfg: Neural network configuration
+            input_shape: Shape of input features
+            num_classes: Number of output classes (None for regression)
+            
+        Returns:
+            Uncompiled Keras neural network
+        """
+        from tensorflow.keras import layers, models
         
-        if num_classes is not None:
-            if num_classes == 2:
-                loss = "binary_crossentropy"
-                metrics = ["accuracy"]
-            else:
-                loss = "sparse_categorical_crossentropy"
-                metrics = ["accuracy"]
-        else:
-            loss = "mse"
-            metrics = ["mae"]
+        # Build the whole graph functionally: input -> hidden layers -> head
+        x = inputs = layers.Input(shape=input_shape)
         
-        model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
+        # Hidden layers
+        for units in ModelFactory._tensorcore_aligned(cfg, cfg.hidden_layers):
+            x = layers.Dense(units, activation=cfg.activation)(x)
+            if cfg.dropout_rate > 0:
+                x = ModelFactory._dense_dropout(cfg)(x)
         
-        logger.info(f"Created neural network with {len(hidden_layers)} hidden layers")
-        return model
+        return models.Model(inputs, ModelFactory._output_head(x, num_classes))
     
     @staticmethod
     def create_cnn(
-        config: Dict[str, Any],
+        config: Union[Dict[str, Any], CNNConfig],
         input_shape: Tuple,
         num_classes: Optional[int] = None
-    ) -> tf.keras.Model:
+    ) -> "tf.keras.Model":
         """
         Create a convolutional neural network.
         
         Args:
             config: Model configuration
-            input_shape: Shape of input images (height, width, channels)
+            input_shape: Shape of input images (height, width, channels), channels last
             num_classes: Number of output classes (None for regression)
             
         Returns:
@@ -285,77 +541,63 @@ class ModelFactory:
         if input_shape is None or len(input_shape) != 3:
             raise ValueError("input_shape must be a 3D tuple (height, width, channels) for CNNs")
         
-        filters = config.get("filters", [32, 64, 128])
-        kernel_sizes = config.get("kernel_sizes", [3, 3, 3])
-        pool_sizes = config.get("pool_sizes", [2, 2, 2])
-        dense_layers = config.get("dense_layers", [128])
-        activation = config.get("activation", "relu")
-        dropout_rate = config.get("dropout_rate", 0.2)
+        cfg = _coerce_config(CNNConfig, config)
+        ModelFactory._apply_precision_policy(cfg)
         
-        model = models.Sequential()
+        model = ModelFactory._from_template(ModelFactory._build_cnn, cfg, input_shape, num_classes)
+        
+        logger.info(f"Created CNN with {len(cfg.filters)} convolutional layers")
+        return model
+    
+    @staticmethod
+    def _build_cnn(
+        cfg: CNNConfig,
+        input_shape: Tuple,
+        num_classes: Optional[int]
+    ) -> "tf.keras.Model":
+        """
+        Build the uncompiled graph of a convolutional neural network.
+        
+        Args:
+            cfg: CNN configuration
+            input_shape: Shape of input images (height, width, channels)
+            num_classes: Number of output classes (None for regression)
+            
+        Returns:
+            Uncompiled Keras CNN
+        """
+        from tensorflow.keras import layers, models
         
-        # Input layer
-        model.add(layers.InputLayer(input_shape=input_shape))
+        # Build the whole graph functionally: input -> conv blocks -> dense -> head
+        x = inputs = layers.Input(shape=input_shape, dtype=cfg.input_dtype)
+        if cfg.input_dtype == "uint8":
+            x = layers.Rescaling(1.0 / 255.0)(x)
         
         # Convolutional layers
-        for i, (f, k, p) in enumerate(zip(filters, kernel_sizes, pool_sizes)):
-            model.add(layers.Conv2D(f, (k, k), activation=activation, padding="same"))
-            model.add(layers.MaxPooling2D((p, p)))
+        filters = ModelFactory._tensorcore_aligned(cfg, cfg.filters)
+        for spec, f in zip(cfg.conv_specs, filters):
+            x = layers.Conv2D(f, (spec.kernel, spec.kernel), activation=cfg.activation, padding="same")(x)
+            x = layers.MaxPooling2D((spec.pool, spec.pool))(x)
+            if cfg.dropout_rate > 0 and cfg.dropout_variant == "spatial":
+                x = layers.SpatialDropout2D(cfg.dropout_rate)(x)
         
         # Flatten before dense layers
-        model.add(layers.Flatten())
+        x = layers.Flatten()(x)
         
         # Dense layers
-        for units in dense_layers:
-            model.add(layers.Dense(units, activation=activation))
-            if dropout_rate > 0:
-                model.add(layers.Dropout(dropout_rate))
-        
-        # Output layer
-        if num_classes is not None:
-            if num_classes == 2:
-                model.add(layers.Dense(1, activation="sigmoid"))
-            else:
-                model.add(layers.Dense(num_classes, activation="softmax"))
-        else:
-            model.add(layers.Dense(1))  # Regression
-        
-        # Compile the model
-        optimizer_config = config.get("optimizer", {"type": "adam", "learning_rate": 0.001})
-        optimizer_type = optimizer_config.get("type", "adam")
-        learning_rate = optimizer_config.get("learning_rate", 0.001)
-        
-        if optimizer_type == "adam":
-            optimizer = optimizers.Adam(learning_rate=learning_rate)
-        elif optimizer_type == "sgd":
-            optimizer = optimizers.SGD(learning_rate=learning_rate)
-        elif optimizer_type == "rmsprop":
-            optimizer = optimizers.RMSprop(learning_rate=learning_rate)
-        else:
-            raise ValueError(f"Unsupported optimizer: {optimizer_type}")
-        
-        if num_classes is not None:
-            if num_classes == 2:
-                loss = "binary_crossentropy"
-                metrics = ["accuracy"]
-            else:
-                loss = "sparse_categorical_crossentropy"
-                metrics = ["accuracy"]
-        else:
-            loss = "mse"
-            metrics = ["mae"]
+        for units in ModelFactory._tensorcore_aligned(cfg, cfg.dense_layers):
+            x = layers.Dense(units, activation=cfg.activation)(x)
+            if cfg.dropout_rate > 0:
+                x = ModelFactory._dense_dropout(cfg)(x)
         
-        model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
-        
-        logger.info(f"Created CNN with {len(filters)} convolutional layers")
-        return model
+        return models.Model(inputs, ModelFactory._output_head(x, num_classes))
     
     @staticmethod
     def create_lstm(
-        config: Dict[str, Any],
+        config: Union[Dict[str, Any], LSTMConfig],
         input_shape: Tuple,
         num_classes: Optional[int] = None
-    ) -> tf.keras.Model:
+    ) -> "tf.keras.Model":
         """
         Create an LSTM model for sequence data.
         
@@ -370,67 +612,521 @@ class ModelFactory:
         if input_shape is None or len(input_shape) != 2:
             raise ValueError("input_shape must be a 2D tuple (timesteps, features) for LSTMs")
         
-        lstm_units = config.get("lstm_units", [64, 32])
-        dense_layers = config.get("dense_layers", [32])
-        activation = config.get("activation", "relu")
-        dropout_rate = config.get("dropout_rate", 0.2)
+        cfg = _coerce_config(LSTMConfig, config)
+        ModelFactory._apply_precision_policy(cfg)
+        
+        if cfg.unroll and input_shape[0] is not None:
+            logger.warning("Unrolled LSTM layers cannot use the CuDNN kernel")
         
-        model = models.Sequential()
+        # LSTM layers keep the CuDNN-compatible activations; "activation"
+        # only applies to the dense layers after them
+        if cfg.lstm_activation != "tanh" or cfg.recurrent_dropout:
+            logger.warning(
+                "Ignoring lstm_activation/recurrent_dropout to keep the CuDNN LSTM kernel; "
+                "use dropout_rate and the dense layer activation instead"
+            )
         
-        # Input layer
-        model.add(layers.InputLayer(input_shape=input_shape))
+        model = ModelFactory._from_template(ModelFactory._build_lstm, cfg, input_shape, num_classes)
+        
+        logger.info(f"Created LSTM with {len(cfg.lstm_units)} LSTM layers")
+        return model
+    
+    @staticmethod
+    def _build_lstm(
+        cfg: LSTMConfig,
+        input_shape: Tuple,
+        num_classes: Optional[int]
+    ) -> "tf.keras.Model":
+        """
+        Build the uncompiled graph of an LSTM model.
+        
+        Args:
+            cfg: LSTM configuration
+            input_shape: Shape of input sequences (timesteps, features)
+            num_classes: Number of output classes (None for regression)
+            
+        Returns:
+            Uncompiled Keras LSTM model
+        """
+        from tensorflow.keras import layers, models
+        
+        # Unrolling lets XLA fuse the time loop, but only works with a static
+        # number of timesteps and trades away the fused CuDNN kernel
+        unroll = cfg.unroll and input_shape[0] is not None
+        
+        # Build the whole graph functionally: input -> LSTM stack -> dense -> head
+        x = inputs = layers.Input(shape=input_shape)
         
         # LSTM layers
+        lstm_units = ModelFactory._tensorcore_aligned(cfg, cfg.lstm_units)
         for i, units in enumerate(lstm_units):
             return_sequences = i < len(lstm_units) - 1
-            model.add(layers.LSTM(units, return_sequences=return_sequences))
-            if dropout_rate > 0:
-                model.add(layers.Dropout(dropout_rate))
+            x = layers.LSTM(
+                units,
+                activation="tanh",
+                recurrent_activation="sigmoid",
+                recurrent_dropout=0.0,
+                unroll=unroll,
+                use_bias=True,
+                return_sequences=return_sequences,
+            )(x)
+            if cfg.dropout_rate > 0:
+                x = layers.Dropout(cfg.dropout_rate)(x)
         
         # Dense layers
-        for units in dense_layers:
-            model.add(layers.Dense(units, activation=activation))
-            if dropout_rate > 0:
-                model.add(layers.Dropout(dropout_rate))
-        
-        # Output layer
-        if num_classes is not None:
-            if num_classes == 2:
-                model.add(layers.Dense(1, activation="sigmoid"))
-            else:
-                model.add(layers.Dense(num_classes, activation="softmax"))
-        else:
-            model.add(layers.Dense(1))  # Regression
+        for units in ModelFactory._tensorcore_aligned(cfg, cfg.dense_layers):
+            x = layers.Dense(units, activation=cfg.activation)(x)
+            if cfg.dropout_rate > 0:
+                x = ModelFactory._dense_dropout(cfg)(x)
+        
+        return models.Model(inputs, ModelFactory._output_head(x, num_classes))
+    
+    @staticmethod
+    def _from_template(
+        build: Callable[..., "tf.keras.Model"],
+        cfg: KerasConfig,
+        input_shape: Tuple,
+        num_classes: Optional[int],
+    ) -> "tf.keras.Model":
+        """
+        Create a compiled model by cloning the cached template for its architecture.
+        
+        Clones get freshly initialized weights and their own optimizer, so
+        repeated calls with the same config (e.g. during hyperparameter
+        search) only skip re-parsing the config and rebuilding the graph.
+        
+        Args:
+            build: Builder returning the uncompiled model for cfg
+            cfg: Keras model configuration
+            input_shape: Shape of model inputs
+            num_classes: Number of output classes (None for regression)
+            
+        Returns:
+            Compiled Keras model
+        """
+        from tensorflow.keras import models
+        
+        template = _keras_template(build, cfg, tuple(input_shape), num_classes)
+        
+        # Variables must be created under the strategy to be mirrored across devices
+        with ModelFactory._get_strategy(cfg).scope():
+            model = models.clone_model(template)
+            ModelFactory._compile_model(model, cfg, num_classes)
+        
+        return model
+    
+    @staticmethod
+    def _dense_dropout(cfg: KerasConfig) -> "tf.keras.layers.Layer":
+        """
+        Create the dropout layer that follows a dense layer.
+        
+        Args:
+            cfg: Keras model configuration
+            
+        Returns:
+            GaussianDropout for the "gaussian" variant, Dropout otherwise
+        """
+        from tensorflow.keras import layers
+        
+        if cfg.dropout_variant == "gaussian":
+            return layers.GaussianDropout(cfg.dropout_rate)
+        return layers.Dropout(cfg.dropout_rate)
+    
+    @staticmethod
+    def _tensorcore_aligned(cfg: KerasConfig, sizes: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        Pad layer widths for tensor cores under a mixed precision policy.
+        
+        Tensor cores only run float16/bfloat16 matmuls and convolutions whose
+        channel dimensions are multiples of 8 (16 or more pays off on newer
+        GPUs, see cfg.tensorcore_multiple); misaligned layers fall back to
+        much slower kernels. float32 models are left unchanged.
+        
+        Args:
+            cfg: Keras model configuration
+            sizes: Units or filters of consecutive layers
+            
+        Returns:
+            Layer sizes rounded up to cfg.tensorcore_multiple
+        """
+        if cfg.precision == "float32" or not sizes:
+            return sizes
+        
+        multiple = cfg.tensorcore_multiple
+        return tuple(-(-size // multiple) * multiple for size in sizes)
+    
+    @staticmethod
+    def save(model: BaseEstimator, path: str) -> None:
+        """
+        Save a scikit-learn or XGBoost model for memory-mapped loading.
+        
+        Arrays are written uncompressed, as required for load(mmap=True).
+        
+        Args:
+            model: Fitted estimator
+            path: Destination file
+        """
+        joblib.dump(model, path, compress=0, protocol=5)
+        logger.info(f"Saved model to {path}")
+    
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> BaseEstimator:
+        """
+        Load a model written by save().
+        
+        With mmap, the model's NumPy arrays (e.g. the node arrays of every
+        tree in a forest) are memory-mapped read-only, so worker processes
+        loading the same file share pages instead of each holding a copy.
+        
+        Args:
+            path: File written by save()
+            mmap: Whether to memory-map the model's arrays
+            
+        Returns:
+            Loaded estimator
+        """
+        return joblib.load(path, mmap_mode="r" if mmap else None)
+    
+    @staticmethod
+    def compile_trees(
+        model: "xgb.XGBModel",
+        libpath: str,
+        quantize: bool = True,
+        parallel_comp: int = 32,
+    ) -> "treelite_runtime.Predictor":
+        """
+        Compile a fitted XGBoost model into a native Treelite predictor.
+        
+        Tree traversal becomes generated C code instead of interpreted node
+        arrays; with quantize, split thresholds are replaced by integer bin
+        indices so traversal compares integers rather than floats.
+        
+        Args:
+            model: Fitted XGBoost estimator
+            libpath: Path of the shared library to generate
+            quantize: Whether to quantize split thresholds
+            parallel_comp: Number of source files to split the trees across
+                for parallel compilation
+            
+        Returns:
+            Treelite predictor; call predict(treelite_runtime.DMatrix(X))
+        """
+        import treelite
+        import treelite_runtime
+        
+        tl_model = treelite.Model.from_xgboost(model.get_booster())
+        tl_model.export_lib(
+            toolchain="gcc",
+            libpath=libpath,
+            params={"parallel_comp": parallel_comp, "quantize": int(quantize)},
+        )
+        
+        logger.info(f"Compiled {tl_model.num_tree} trees to {libpath}")
+        return treelite_runtime.Predictor(libpath)
+    
+    @staticmethod
+    def _output_head(x: "tf.Tensor", num_classes: Optional[int]) -> "tf.Tensor":
+        """
+        Add the output layer for the task.
+        
+        The output is kept in float32 for numerically stable sigmoid/softmax
+        under mixed precision.
+        
+        Args:
+            x: Output tensor of the last hidden layer
+            num_classes: Number of output classes (None for regression)
+            
+        Returns:
+            Model output tensor
+        """
+        from tensorflow.keras import layers
+        
+        if num_classes is None:
+            return layers.Dense(1, dtype="float32")(x)  # Regression
+        if num_classes == 2:
+            return layers.Dense(1, activation="sigmoid", dtype="float32")(x)
+        return layers.Dense(num_classes, activation="softmax", dtype="float32")(x)
+    
+    @staticmethod
+    def _apply_precision_policy(cfg: KerasConfig) -> None:
+        """
+        Set the global Keras precision policy for the layers about to be built.
+        
+        With "mixed_float16" or "mixed_bfloat16", layers compute in 16-bit
+        while keeping float32 weights; Keras applies loss scaling for float16.
+        
+        Args:
+            cfg: Keras model configuration
+        """
+        from tensorflow.keras import mixed_precision
+        
+        policy = cfg.precision
+        mixed_precision.set_global_policy(policy)
+        if policy != "float32":
+            logger.info(f"Using {policy} precision policy")
+    
+    @staticmethod
+    def init_strategy(name: str) -> "tf.distribute.Strategy":
+        """
+        Create the process's distribution strategy ahead of any model.
+        
+        MultiWorkerMirroredStrategy can only be created before TensorFlow
+        runs any op, so training entry points call this at startup; models
+        built later reuse the same strategy.
+        
+        Args:
+            name: "mirrored", "multi_worker" or "one_device"
+            
+        Returns:
+            Distribution strategy
+        """
+        return _distribution_strategy(name)
+    
+    @staticmethod
+    def _get_strategy(cfg: KerasConfig) -> "tf.distribute.Strategy":
+        """
+        Resolve the tf.distribute strategy a Keras model is built under.
+        
+        Args:
+            cfg: Keras model configuration; strategy is "mirrored",
+                "multi_worker", "one_device" or None
+        
+        Returns:
+            Distribution strategy; the default (no-op) strategy if none is set
+        """
+        import tensorflow as tf
+        
+        if cfg.strategy is None:
+            return tf.distribute.get_strategy()
+        return _distribution_strategy(cfg.strategy)
+    
+    @staticmethod
+    def distributed_dataset_options() -> "tf.data.Options":
+        """
+        Create tf.data options for feeding a model built under a strategy.
+        
+        Sharding by data lets each worker read the same files but keep only
+        its share of the elements, which works for in-memory datasets too.
+        
+        Returns:
+            Options to apply with dataset.with_options()
+        """
+        import tensorflow as tf
+        
+        options = tf.data.Options()
+        options.experimental_distribute.auto_shard_policy = (
+            tf.data.experimental.AutoShardPolicy.DATA
+        )
+        return options
+    
+    @staticmethod
+    def _build_optimizer(optimizer_config: Dict[str, Any]) -> "tf.keras.optimizers.Optimizer":
+        """
+        Create a Keras optimizer from its configuration.
+        
+        Args:
+            optimizer_config: Optimizer type, learning rate and extra keyword arguments
+            
+        Returns:
+            Keras optimizer instance
+        """
+        from tensorflow.keras import optimizers
         
-        # Compile the model
-        optimizer_config = config.get("optimizer", {"type": "adam", "learning_rate": 0.001})
         optimizer_type = optimizer_config.get("type", "adam")
-        learning_rate = optimizer_config.get("learning_rate", 0.001)
-        
-        if optimizer_type == "adam":
-            optimizer = optimizers.Adam(learning_rate=learning_rate)
-        elif optimizer_type == "sgd":
-            optimizer = optimizers.SGD(learning_rate=learning_rate)
-        elif optimizer_type == "rmsprop":
-            optimizer = optimizers.RMSprop(learning_rate=learning_rate)
-        else:
-            raise ValueError(f"Unsupported optimizer: {optimizer_type}")
+        try:
+            optimizer_class = getattr(optimizers, _OPTIMIZER_CLASSES[optimizer_type])
+        except KeyError:
+            raise ValueError(f"Unsupported optimizer: {optimizer_type}") from None
         
-        if num_classes is not None:
-            if num_classes == 2:
-                loss = "binary_crossentropy"
-                metrics = ["accuracy"]
-            else:
-                loss = "sparse_categorical_crossentropy"
-                metrics = ["accuracy"]
-        else:
-            loss = "mse"
-            metrics = ["mae"]
+        return optimizer_class(
+            learning_rate=optimizer_config.get("learning_rate", 0.001),
+            **optimizer_config.get("extra", {}),
+        )
+    
+    @staticmethod
+    def _select_loss_metrics(num_classes: Optional[int]) -> Tuple[str, List[str]]:
+        """
+        Choose the loss and metrics for a Keras model's output.
         
-        model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
+        Args:
+            num_classes: Number of output classes (None for regression)
+            
+        Returns:
+            Tuple of (loss, metrics)
+        """
+        if num_classes is None:
+            return "mse", ["mae"]
+        if num_classes == 2:
+            return "binary_crossentropy", ["accuracy"]
+        return "sparse_categorical_crossentropy", ["accuracy"]
+    
+    @staticmethod
+    def _compile_model(
+        model: "tf.keras.Model",
+        cfg: KerasConfig,
+        num_classes: Optional[int],
+    ) -> None:
+        """
+        Compile a Keras model with the configured optimizer, loss and metrics.
         
-        logger.info(f"Created LSTM with {len(lstm_units)} LSTM layers")
+        Args:
+            model: Keras model to compile
+            cfg: Keras model configuration
+            num_classes: Number of output classes (None for regression)
+        """
+        optimizer = ModelFactory._build_optimizer(cfg.optimizer)
+        loss, metrics = ModelFactory._select_loss_metrics(num_classes)
+        
+        # XLA fuses element-wise ops into fewer kernels; configurable for
+        # models using ops XLA cannot compile
+        model.compile(
+            optimizer=optimizer,
+            loss=loss,
+            metrics=metrics,
+            jit_compile=cfg.jit_compile,
+        )
+    
+    @staticmethod
+    def inference_function(model: "tf.keras.Model") -> Callable:
+        """
+        Wrap a Keras model's forward pass in an XLA-compiled tf.function.
+        
+        Calling the returned function on a batch skips Model.predict's
+        per-call Python overhead; the first call per input shape pays the
+        compilation cost.
+        
+        Args:
+            model: Keras model
+            
+        Returns:
+            Compiled function mapping an input batch to model outputs
+        """
+        import tensorflow as tf
+        
+        return tf.function(lambda x: model(x, training=False), jit_compile=True)
+    
+    @staticmethod
+    def precompile_and_save(
+        model_type: str,
+        model_config: Dict[str, Any],
+        path: str,
+        dummy_input_shape: Tuple[int, ...],
+        num_classes: Optional[int] = None,
+    ) -> "tf.keras.Model":
+        """
+        Build a Keras model, trace its XLA inference function and save it.
+        
+        The SavedModel stores the traced serving graph, so tf.saved_model.load
+        skips Python tracing. To also reuse the compiled XLA executables
+        across processes, set TF_XLA_FLAGS=--tf_xla_persistent_cache_directory=<dir>
+        before TensorFlow is imported.
+        
+        Args:
+            model_type: Keras model type ("neural_network", "cnn" or "lstm")
+            model_config: Configuration parameters for the model
+            path: SavedModel directory to write
+            dummy_input_shape: Input shape including the batch dimension,
+                used to trigger compilation
+            num_classes: Number of output classes (None for regression)
+            
+        Returns:
+            The built Keras model
+        """
+        import tensorflow as tf
+        
+        model = ModelFactory.create_model(
+            model_type, model_config, input_shape=tuple(dummy_input_shape[1:]), num_classes=num_classes
+        )
+        
+        dtype = model.inputs[0].dtype
+        serve = tf.function(
+            lambda inputs: {"outputs": model(inputs, training=False)},
+            input_signature=[tf.TensorSpec((None, *dummy_input_shape[1:]), dtype, name="inputs")],
+            jit_compile=True,
+        )
+        serve(tf.zeros(dummy_input_shape, dtype))  # Force tracing and XLA compilation
+        
+        tf.saved_model.save(model, path, signatures={"serving_default": serve})
+        logger.info(f"Saved precompiled {model_type} model to {path}")
         return model
+    
+    @staticmethod
+    def export_aot(
+        model: "tf.keras.Model",
+        out_dir: str,
+        batch_shape: Tuple[int, ...],
+        cpp_class: str = "InferModel",
+        target_triple: str = "x86_64-pc-linux",
+    ) -> str:
+        """
+        Compile a Keras model ahead of time into a C++ object file and header.
+        
+        The model is traced for a single fixed batch shape and compiled with
+        `saved_model_cli aot_compile_cpu`, so the result runs without the
+        TensorFlow runtime or any JIT compilation at inference time. The
+        generated class takes the input as argument "inputs" and returns
+        the model output as result "outputs".
+        
+        Args:
+            model: Keras model
+            out_dir: Directory for the generated files
+            batch_shape: Full input shape including the batch dimension
+            cpp_class: Name of the generated C++ class
+            target_triple: LLVM target triple to compile for
+            
+        Returns:
+            Output prefix of the generated <prefix>.h and <prefix>.o files
+            
+        Raises:
+            RuntimeError: If saved_model_cli is not installed
+        """
+        import tensorflow as tf
+        
+        if shutil.which("saved_model_cli") is None:
+            raise RuntimeError("saved_model_cli is required for AOT compilation")
+        
+        serve = tf.function(
+            lambda inputs: {"outputs": model(inputs, training=False)},
+            input_signature=[tf.TensorSpec(batch_shape, model.inputs[0].dtype, name="inputs")],
+        )
+        
+        os.makedirs(out_dir, exist_ok=True)
+        output_prefix = os.path.join(out_dir, cpp_class.lower())
+        with tempfile.TemporaryDirectory() as saved_model_dir:
+            tf.saved_model.save(model, saved_model_dir, signatures={"serving_default": serve})
+            subprocess.run(
+                [
+                    "saved_model_cli", "aot_compile_cpu",
+                    "--dir", saved_model_dir,
+                    "--tag_set", "serve",
+                    "--signature_def_key", "serving_default",
+                    "--output_prefix", output_prefix,
+                    "--cpp_class", cpp_class,
+                    "--target_triple", target_triple,
+                ],
+                check=True,
+            )
+        
+        logger.info(f"AOT-compiled model for batch shape {batch_shape} to {output_prefix}")
+        return output_prefix
+
+
+def _config_only(builder: Callable[[Dict[str, Any]], BaseEstimator]) -> Callable[..., BaseEstimator]:
+    """Adapt a config-only builder to the (config, input_shape, num_classes) signature."""
+    return lambda config, input_shape, num_classes: builder(config)
+
+
+# Model type -> builder taking (config, input_shape, num_classes)
+_MODEL_BUILDERS: Dict[str, Callable[..., Union[BaseEstimator, "tf.keras.Model"]]] = {
+    "random_forest": _config_only(ModelFactory.create_random_forest),
+    "logistic_regression": _config_only(ModelFactory.create_logistic_regression),
+    "linear_regression": _config_only(ModelFactory.create_linear_regression),
+    "gradient_boosting": _config_only(ModelFactory.create_gradient_boosting),
+    "xgboost": _config_only(ModelFactory.create_xgboost),
+    "neural_network": ModelFactory.create_neural_network,
+    "cnn": ModelFactory.create_cnn,
+    "lstm": ModelFactory.create_lstm,
+}
 
 
 if __name__ == "__main__":
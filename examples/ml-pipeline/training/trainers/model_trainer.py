@@ -8,24 +8,27 @@ experiment tracking and hyperparameter optimization.
 import os
 import json
 import logging
-import pickle
+import time
 from datetime import datetime
-from typing import Dict, List, Tuple, Any, Optional, Union, Callable
+from typing import TYPE_CHECKING, Dict, List, Tuple, Any, Optional, Union, Callable
 
 import numpy as np
 import pandas as pd
 import mlflow
 import mlflow.sklearn
-import mlflow.tensorflow
-import mlflow.pytorch
+from mlflow.entities import Metric
+from mlflow.tracking import MlflowClient
 import optuna
-from optuna.integration.mlflow import MLflowCallback
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.base import BaseEstimator
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from sklearn.metrics import accuracy_score
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-import tensorflow as tf
-import torch
+
+# TensorFlow and the MLflow TensorFlow flavor are imported where neural
+# networks are handled so that training a scikit-learn model does not load them
+if TYPE_CHECKING:
+    import tensorflow as tf
 
 # Import the model factory
 import sys
@@ -40,6 +43,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tuned parameter -> key in a Keras model's "optimizer" config
+_OPTIMIZER_PARAMS = {
+    "learning_rate": "learning_rate",
+    "optimizer_type": "type",
+}
+
+
+def _optimize_in_worker(
+    study_name: str,
+    journal_path: str,
+    objective: Callable,
+    n_trials: int,
+    timeout: Optional[int],
+) -> None:
+    """Run a share of a study's trials in a worker process."""
+    storage = optuna.storages.JournalStorage(optuna.storages.JournalFileStorage(journal_path))
+    study = optuna.load_study(study_name=study_name, storage=storage)
+    study.optimize(objective, n_trials=n_trials, timeout=timeout)
+
+
+def _classification_metrics(
+    y_true: Union[np.ndarray, pd.Series],
+    y_pred: np.ndarray,
+    num_classes: Optional[int],
+) -> Dict[str, float]:
+    """
+    Compute accuracy, plus precision/recall/F1 for binary classification.
+    
+    Binary metrics are derived from one set of confusion counts instead of
+    one pass over the labels per metric. As with scikit-learn's default
+    pos_label, the positive class is 1; for label pairs without a 1 (e.g.
+    strings) it is the larger of the two labels.
+    
+    Args:
+        y_true: True labels
+        y_pred: Predicted labels
+        num_classes: Number of classes
+        
+    Returns:
+        Dictionary of metric name to value
+    """
+    accuracy = accuracy_score(y_true, y_pred)
+    if num_classes != 2:
+        return {"accuracy": accuracy}
+    
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    labels = np.unique(np.concatenate([y_true, y_pred]))
+    if labels.size > 2:
+        raise ValueError(
+            f"Binary classification metrics expect two labels, got {labels.tolist()}"
+        )
+    positive = 1 if labels.dtype.kind in "biuf" and 1 in labels else labels[-1]
+    
+    actual = y_true == positive
+    predicted = y_pred == positive
+    tp = np.count_nonzero(actual & predicted)
+    fp = np.count_nonzero(predicted & ~actual)
+    fn = np.count_nonzero(actual & ~predicted)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    
+    return {
+        "accuracy": accuracy,
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1": float(f1),
+    }
+
 
 class ModelTrainer:
     """Class for training machine learning models with experiment tracking."""
@@ -51,6 +124,7 @@ class ModelTrainer:
         model_config: Dict[str, Any],
         tracking_uri: Optional[str] = None,
         artifacts_dir: str = "./artifacts",
+        preprocess_fn: Optional[Callable] = None,
     ):
         """
         Initialize the model trainer.
@@ -61,11 +135,16 @@ class ModelTrainer:
             model_config: Configuration parameters for the model
             tracking_uri: MLflow tracking URI
             artifacts_dir: Directory to store model artifacts
+            preprocess_fn: Optional (features, target) -> (features, target)
+                function applied to neural network input batches; it receives
+                whole batches, so it must work on tensors with a leading
+                batch dimension
         """
         self.experiment_name = experiment_name
         self.model_type = model_type
         self.model_config = model_config
         self.artifacts_dir = artifacts_dir
+        self.preprocess_fn = preprocess_fn
         
         # Create artifacts directory if it doesn't exist
         os.makedirs(artifacts_dir, exist_ok=True)
@@ -81,6 +160,30 @@ class ModelTrainer:
         self.model = None
         self.is_neural_network = model_type in ["neural_network", "cnn", "lstm"]
         
+        # Distribution strategies must exist before TensorFlow runs any op
+        if self.is_neural_network and model_config.get("strategy"):
+            ModelFactory.init_strategy(model_config["strategy"])
+        
+        # MLflow run left open by train() until evaluate() or close()
+        self._active_run = None
+    
+    def __enter__(self) -> "ModelTrainer":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(status="FAILED" if exc_type is not None else "FINISHED")
+    
+    def close(self, status: str = "FINISHED") -> None:
+        """
+        End the MLflow run left open by train(), if any.
+        
+        Args:
+            status: Final MLflow run status
+        """
+        if self._active_run is not None:
+            mlflow.end_run(status=status)
+            self._active_run = None
+        
     def prepare_data(
         self,
         X: Union[np.ndarray, pd.DataFrame],
@@ -88,46 +191,73 @@ class ModelTrainer:
         test_size: float = 0.2,
         val_size: float = 0.1,
         random_state: int = 42,
+        float32: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Split data into training, validation, and test sets.
         
+        Features keep their type (DataFrames keep their column names) and,
+        unless float32 is set, their dtype; a Series target is converted to
+        a NumPy array once here. The row indices of each split are returned
+        too, so callers holding X as a memory-mapped array can read the
+        splits from it themselves.
+        
         Args:
             X: Features
             y: Target
             test_size: Proportion of data for test set
             val_size: Proportion of train data for validation set
             random_state: Random seed for reproducibility
+            float32: Whether to convert the features to float32; defaults
+                to True for neural networks, which compute in float32 anyway,
+                and False for other models, whose results depend on precision
             
         Returns:
             Dictionary containing train, validation, and test splits
         """
         logger.info("Preparing data splits")
         
+        if float32 is None:
+            float32 = self.is_neural_network
+        if float32:
+            X = X.astype(np.float32, copy=False)
+        y = np.asarray(y)
+        
+        # Determine num_classes for classification tasks
+        classes = np.unique(y)
+        if classes.size <= 10:  # Assume classification if few unique values
+            num_classes = int(classes.size)
+            task_type = "classification"
+        else:
+            num_classes = None
+            task_type = "regression"
+        
+        # Keep class frequencies equal across splits for classification
+        stratify = task_type == "classification"
+        
+        # Split row indices rather than the arrays, so X is copied once into
+        # the final splits instead of also into an intermediate train+val copy
+        indices = np.arange(len(X))
+        
         # First split off test set
-        X_train_val, X_test, y_train_val, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state
+        train_val_idx, test_idx = train_test_split(
+            indices, test_size=test_size, random_state=random_state,
+            stratify=y if stratify else None,
         )
         
         # Then split training set into train and validation
         val_ratio = val_size / (1 - test_size)
-        X_train, X_val, y_train, y_val = train_test_split(
-            X_train_val, y_train_val, test_size=val_ratio, random_state=random_state
+        train_idx, val_idx = train_test_split(
+            train_val_idx, test_size=val_ratio, random_state=random_state,
+            stratify=y[train_val_idx] if stratify else None,
         )
         
-        # Determine input shape for neural networks
-        if isinstance(X, np.ndarray):
-            input_shape = X.shape[1:]
-        else:
-            input_shape = (X.shape[1],)
+        rows = X.iloc if isinstance(X, pd.DataFrame) else X
+        X_train, X_val, X_test = rows[train_idx], rows[val_idx], rows[test_idx]
+        y_train, y_val, y_test = y[train_idx], y[val_idx], y[test_idx]
         
-        # Determine num_classes for classification tasks
-        if len(np.unique(y)) <= 10:  # Assume classification if few unique values
-            num_classes = len(np.unique(y))
-            task_type = "classification"
-        else:
-            num_classes = None
-            task_type = "regression"
+        # Determine input shape for neural networks
+        input_shape = X.shape[1:]
         
         logger.info(f"Data prepared: X_train.shape={X_train.shape}, y_train.shape={y_train.shape}")
         
@@ -138,11 +268,55 @@ class ModelTrainer:
             "y_val": y_val,
             "X_test": X_test,
             "y_test": y_test,
+            "train_idx": train_idx,
+            "val_idx": val_idx,
+            "test_idx": test_idx,
             "input_shape": input_shape,
             "num_classes": num_classes,
             "task_type": task_type,
         }
 
+    def _make_tf_dataset(
+        self,
+        X: Union[np.ndarray, pd.DataFrame],
+        y: Union[np.ndarray, pd.Series],
+        batch_size: int,
+        shuffle: bool = False,
+    ) -> "tf.data.Dataset":
+        """
+        Build a batched, prefetching tf.data pipeline over in-memory data.
+        
+        Prefetching prepares the next batch on the host while the current
+        one is being processed, so the accelerator does not wait on copies.
+        preprocess_fn is mapped after batching so it runs once per batch on
+        vectors rather than once per example.
+        
+        Args:
+            X: Features
+            y: Target
+            batch_size: Batch size
+            shuffle: Whether to reshuffle the examples every epoch
+            
+        Returns:
+            Dataset of (features, target) batches
+        """
+        import tensorflow as tf
+        
+        # Cache the converted tensors so later epochs replay them directly
+        ds = tf.data.Dataset.from_tensor_slices((X, y)).cache()
+        if shuffle:
+            ds = ds.shuffle(len(X), reshuffle_each_iteration=True)
+        ds = ds.batch(batch_size)
+        if self.preprocess_fn is not None:
+            ds = ds.map(self.preprocess_fn, num_parallel_calls=tf.data.AUTOTUNE)
+        ds = ds.prefetch(tf.data.AUTOTUNE)
+        
+        # Models built under a tf.distribute strategy shard batches by data
+        if self.model_config.get("strategy"):
+            ds = ds.with_options(ModelFactory.distributed_dataset_options())
+        
+        return ds
+    
     def train(
         self,
         data: Dict[str, Any],
@@ -150,6 +324,8 @@ class ModelTrainer:
         batch_size: int = 32,
         early_stopping: bool = True,
         patience: int = 5,
+        precision: Optional[str] = None,
+        log_train_metrics: bool = False,
     ) -> Any:
         """
         Train the model.
@@ -160,22 +336,46 @@ class ModelTrainer:
             batch_size: Batch size for neural networks
             early_stopping: Whether to use early stopping for neural networks
             patience: Patience for early stopping
+            precision: Keras precision policy for neural networks ("float32",
+                "mixed_float16" or "mixed_bfloat16"); defaults to the model
+                config's, else mixed_float16 when a GPU is available
+            log_train_metrics: Whether to predict on the training set to log
+                training metrics for classical models
             
         Returns:
             Trained model
         """
-        with mlflow.start_run() as run:
+        # The run stays open so evaluate() can log to it without resuming it;
+        # it is ended by evaluate(), close() or the next train()
+        self.close()
+        run = mlflow.start_run()
+        self._active_run = run
+        try:
             run_id = run.info.run_id
             logger.info(f"Started MLflow run: {run_id}")
             
+            model_config = self.model_config
+            if self.is_neural_network:
+                import tensorflow as tf
+                
+                # XLA auto-clustering plus 16-bit tensor-core compute; the
+                # factory keeps the output layer in float32 for a stable loss
+                tf.config.optimizer.set_jit(True)
+                if precision is None:
+                    gpu_available = bool(tf.config.list_physical_devices("GPU"))
+                    precision = self.model_config.get(
+                        "precision", "mixed_float16" if gpu_available else "float32"
+                    )
+                model_config = {**self.model_config, "precision": precision}
+            
             # Log model configuration
-            mlflow.log_params(self.model_config)
+            mlflow.log_params(model_config)
             mlflow.log_param("model_type", self.model_type)
             
             # Create model
             model = ModelFactory.create_model(
                 self.model_type,
-                self.model_config,
+                model_config,
                 input_shape=data.get("input_shape"),
                 num_classes=data.get("num_classes"),
             )
@@ -192,7 +392,7 @@ class ModelTrainer:
                     )
                     callbacks.append(early_stop)
                 
-                # Add MLflow callback for TensorFlow
+                # Log each epoch's metrics to MLflow in a single request
                 mlflow_callback = tf.keras.callbacks.LambdaCallback(
                     on_epoch_end=lambda epoch, logs: mlflow.log_metrics(logs, step=epoch)
                 )
@@ -200,74 +400,44 @@ class ModelTrainer:
                 
                 # Train neural network
                 logger.info(f"Training {self.model_type} for {epochs} epochs")
-                history = model.fit(
-                    data["X_train"], data["y_train"],
+                model.fit(
+                    self._make_tf_dataset(data["X_train"], data["y_train"], batch_size, shuffle=True),
                     epochs=epochs,
-                    batch_size=batch_size,
-                    validation_data=(data["X_val"], data["y_val"]),
+                    validation_data=self._make_tf_dataset(data["X_val"], data["y_val"], batch_size),
                     callbacks=callbacks,
                     verbose=1,
                 )
-                
-                # Log training metrics
-                for metric in history.history:
-                    for epoch, value in enumerate(history.history[metric]):
-                        mlflow.log_metric(metric, value, step=epoch)
             else:
                 # Train classical ML model
                 logger.info(f"Training {self.model_type}")
                 model.fit(data["X_train"], data["y_train"])
                 
-                # Log training metrics for classical ML models
-                if data["task_type"] == "classification":
-                    train_preds = model.predict(data["X_train"])
-                    val_preds = model.predict(data["X_val"])
-                    
-                    train_acc = accuracy_score(data["y_train"], train_preds)
-                    val_acc = accuracy_score(data["y_val"], val_preds)
-                    
-                    mlflow.log_metric("train_accuracy", train_acc)
-                    mlflow.log_metric("val_accuracy", val_acc)
-                    
-                    # Log additional metrics for binary classification
-                    if data["num_classes"] == 2:
-                        train_precision = precision_score(data["y_train"], train_preds)
-                        train_recall = recall_score(data["y_train"], train_preds)
-                        train_f1 = f1_score(data["y_train"], train_preds)
-                        
-                        val_precision = precision_score(data["y_val"], val_preds)
-                        val_recall = recall_score(data["y_val"], val_preds)
-                        val_f1 = f1_score(data["y_val"], val_preds)
-                        
-                        mlflow.log_metrics({
-                            "train_precision": train_precision,
-                            "train_recall": train_recall,
-                            "train_f1": train_f1,
-                            "val_precision": val_precision,
-                            "val_recall": val_recall,
-                            "val_f1": val_f1,
-                        })
-                else:
-                    # Regression metrics
-                    train_preds = model.predict(data["X_train"])
-                    val_preds = model.predict(data["X_val"])
-                    
-                    train_mse = mean_squared_error(data["y_train"], train_preds)
-                    train_mae = mean_absolute_error(data["y_train"], train_preds)
-                    train_r2 = r2_score(data["y_train"], train_preds)
-                    
-                    val_mse = mean_squared_error(data["y_val"], val_preds)
-                    val_mae = mean_absolute_error(data["y_val"], val_preds)
-                    val_r2 = r2_score(data["y_val"], val_preds)
-                    
-                    mlflow.log_metrics({
-                        "train_mse": train_mse,
-                        "train_mae": train_mae,
-                        "train_r2": train_r2,
-                        "val_mse": val_mse,
-                        "val_mae": val_mae,
-                        "val_r2": val_r2,
-                    })
+                # Training-set metrics cost a second full pass over X_train,
+                # so they are opt-in; an out-of-bag score computed during
+                # fit (e.g. random forests with oob_score) is free to log
+                splits = [("val", data["X_val"], data["y_val"])]
+                if log_train_metrics:
+                    splits.insert(0, ("train", data["X_train"], data["y_train"]))
+                
+                metrics = {}
+                if getattr(model, "oob_score_", None) is not None:
+                    metrics["train_oob_score"] = model.oob_score_
+                
+                for split, X_split, y_true in splits:
+                    y_pred = model.predict(X_split)
+                    if data["task_type"] == "classification":
+                        # Binary classification also gets precision, recall and F1
+                        split_metrics = _classification_metrics(y_true, y_pred, data["num_classes"])
+                    else:
+                        # Regression metrics
+                        split_metrics = {
+                            "mse": mean_squared_error(y_true, y_pred),
+                            "mae": mean_absolute_error(y_true, y_pred),
+                            "r2": r2_score(y_true, y_pred),
+                        }
+                    metrics.update({f"{split}_{k}": v for k, v in split_metrics.items()})
+                
+                mlflow.log_metrics(metrics)
             
             # Save the model
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -277,14 +447,15 @@ class ModelTrainer:
             
             # Log model to MLflow
             if self.is_neural_network:
-                mlflow.tensorflow.log_model(model, "model")
+                import mlflow.tensorflow as mlflow_tensorflow
+                
+                mlflow_tensorflow.log_model(model, "model")
                 # Save model locally
                 model.save(model_path)
             else:
                 mlflow.sklearn.log_model(model, "model")
-                # Save model locally
-                with open(f"{model_path}.pkl", "wb") as f:
-                    pickle.dump(model, f)
+                # Save model locally, uncompressed so it can be memory-mapped
+                ModelFactory.save(model, f"{model_path}.joblib")
             
             logger.info(f"Model saved to {model_path}")
             
@@ -293,6 +464,9 @@ class ModelTrainer:
             self.model = model
             
             return model
+        except BaseException:
+            self.close(status="FAILED")
+            raise
     
     def evaluate(self, data: Dict[str, Any]) -> Dict[str, float]:
         """
@@ -315,21 +489,21 @@ class ModelTrainer:
         # Calculate metrics based on task type
         metrics = {}
         if data["task_type"] == "classification":
-            metrics["test_accuracy"] = accuracy_score(data["y_test"], y_pred)
-            
-            if data["num_classes"] == 2:
-                metrics["test_precision"] = precision_score(data["y_test"], y_pred)
-                metrics["test_recall"] = recall_score(data["y_test"], y_pred)
-                metrics["test_f1"] = f1_score(data["y_test"], y_pred)
+            test_metrics = _classification_metrics(data["y_test"], y_pred, data["num_classes"])
+            metrics.update({f"test_{k}": v for k, v in test_metrics.items()})
         else:
             # Regression metrics
             metrics["test_mse"] = mean_squared_error(data["y_test"], y_pred)
             metrics["test_mae"] = mean_absolute_error(data["y_test"], y_pred)
             metrics["test_r2"] = r2_score(data["y_test"], y_pred)
         
-        # Log metrics to MLflow
-        with mlflow.start_run(run_id=self.run_id):
-            mlflow.log_metrics(metrics)
+        # Log metrics to the training run in one request, without resuming it
+        timestamp = int(time.time() * 1000)
+        MlflowClient().log_batch(
+            self.run_id,
+            metrics=[Metric(k, float(v), timestamp, 0) for k, v in metrics.items()],
+        )
+        self.close()
         
         logger.info(f"Evaluation metrics: {metrics}")
         return metrics
@@ -341,22 +515,50 @@ class ModelTrainer:
         n_trials: int = 10,
         cv: int = 3,
         timeout: Optional[int] = None,
+        n_jobs: int = 1,
     ) -> Dict[str, Any]:
         """
         Perform hyperparameter tuning using Optuna.
         
+        Classical models with n_jobs != 1 run their trials in separate worker
+        processes sharing a journal-file study, since CPU-bound scikit-learn
+        fits do not scale across Optuna's threads. Neural networks always run
+        in this process.
+        
         Args:
             data: Dictionary containing data splits
             param_space: Parameter space to search
             n_trials: Number of trials
             cv: Number of cross-validation folds
             timeout: Timeout in seconds
+            n_jobs: Number of worker processes for classical models (-1 for all CPUs)
             
         Returns:
             Best hyperparameters
         """
         logger.info(f"Starting hyperparameter tuning with {n_trials} trials")
         
+        # Trials are logged as their own MLflow runs
+        self.close()
+        
+        # Use fewer epochs for tuning
+        tuning_epochs = 5
+        
+        # Split the cores between trial workers and the CV folds inside each
+        # trial so the two levels of parallelism do not oversubscribe them
+        n_workers = min(effective_n_jobs(n_jobs), n_trials)
+        cv_n_jobs = max(1, (os.cpu_count() or 1) // n_workers) if n_workers > 1 else -1
+        
+        # Neural network trials share one pair of input pipelines, so the
+        # arrays are converted and cached once rather than once per trial
+        train_ds = val_ds = None
+        if self.is_neural_network:
+            train_ds = self._make_tf_dataset(data["X_train"], data["y_train"], 32, shuffle=True)
+            val_ds = self._make_tf_dataset(data["X_val"], data["y_val"], 32)
+        
+        input_shape = data.get("input_shape")
+        num_classes = data.get("num_classes")
+        
         # Define the objective function for Optuna
         def objective(trial):
             # Sample hyperparameters from the parameter space
@@ -381,28 +583,36 @@ class ModelTrainer:
                         log=param_config.get("log", False)
                     )
             
-            # Create model with sampled hyperparameters
-            model_config = {**self.model_config, **params}
+            # Create model with sampled hyperparameters; trials that only
+            # change optimizer settings reuse the factory's cached skeleton
+            model_config = self._with_params(params)
+            if not self.is_neural_network:
+                # Trial workers and CV folds already spread over the cores,
+                # so each fold fits its estimator single-threaded
+                model_config["n_jobs"] = 1
             model = ModelFactory.create_model(
                 self.model_type,
                 model_config,
-                input_shape=data.get("input_shape"),
-                num_classes=data.get("num_classes"),
+                input_shape=input_shape,
+                num_classes=num_classes,
             )
             
             # For neural networks, we'll use a simplified training process
             if self.is_neural_network:
-                # Simple train/validation split evaluation for neural networks
+                from optuna.integration import TFKerasPruningCallback
+                
+                # Simple train/validation split evaluation for neural networks;
+                # report val_loss every epoch so the pruner can stop bad trials early
                 model.fit(
-                    data["X_train"], data["y_train"],
-                    epochs=5,  # Use fewer epochs for tuning
-                    batch_size=32,
-                    validation_data=(data["X_val"], data["y_val"]),
+                    train_ds,
+                    epochs=tuning_epochs,
+                    validation_data=val_ds,
+                    callbacks=[TFKerasPruningCallback(trial, "val_loss")],
                     verbose=0,
                 )
                 
                 # Evaluate on validation set
-                val_loss = model.evaluate(data["X_val"], data["y_val"], verbose=0)[0]
+                val_loss = model.evaluate(val_ds, verbose=0)[0]
                 return val_loss
             else:
                 # Use cross-validation for traditional ML models
@@ -412,7 +622,8 @@ class ModelTrainer:
                         data["X_train"], 
                         data["y_train"],
                         cv=cv,
-                        scoring="accuracy"
+                        scoring="accuracy",
+                        n_jobs=cv_n_jobs,
                     )
                     return -scores.mean()  # Negative because Optuna minimizes
                 else:
@@ -421,34 +632,97 @@ class ModelTrainer:
                         data["X_train"], 
                         data["y_train"],
                         cv=cv,
-                        scoring="neg_mean_squared_error"
+                        scoring="neg_mean_squared_error",
+                        n_jobs=cv_n_jobs,
                     )
                     return -scores.mean()  # Negative because Optuna minimizes
         
-        # Set up MLflow callback for Optuna
-        mlflow_callback = MLflowCallback(
-            tracking_uri=mlflow.get_tracking_uri(),
-            metric_name="tuning_metric",
-        )
-        
         # Create and run the study
-        study = optuna.create_study(direction="minimize")
-        study.optimize(
-            objective, 
-            n_trials=n_trials,
-            timeout=timeout,
-            callbacks=[mlflow_callback]
-        )
+        if self.is_neural_network or n_workers <= 1:
+            pruner = optuna.pruners.HyperbandPruner(
+                min_resource=1, max_resource=tuning_epochs, reduction_factor=3
+            ) if self.is_neural_network else None
+            study = optuna.create_study(direction="minimize", pruner=pruner)
+            study.optimize(
+                objective, 
+                n_trials=n_trials,
+                timeout=timeout,
+            )
+        else:
+            journal_path = os.path.join(self.artifacts_dir, "optuna_journal.log")
+            study = optuna.create_study(
+                direction="minimize",
+                study_name=f"{self.experiment_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                storage=optuna.storages.JournalStorage(
+                    optuna.storages.JournalFileStorage(journal_path)
+                ),
+            )
+            
+            # Spread the trials as evenly as possible over the workers
+            trials_per_worker = [
+                n_trials // n_workers + (i < n_trials % n_workers) for i in range(n_workers)
+            ]
+            logger.info(f"Running {n_trials} trials in {n_workers} worker processes")
+            Parallel(n_jobs=n_workers)(
+                delayed(_optimize_in_worker)(
+                    study.study_name, journal_path, objective, n, timeout
+                )
+                for n in trials_per_worker
+            )
         
         # Get best parameters
         best_params = study.best_params
         logger.info(f"Best hyperparameters: {best_params}")
         
+        # Log the whole study to one summary run instead of one run per trial
+        with mlflow.start_run(run_name="hpo_summary") as summary_run:
+            mlflow.log_params(best_params)
+            mlflow.log_metric("best_value", study.best_value)
+            MlflowClient().log_batch(
+                summary_run.info.run_id,
+                metrics=[
+                    Metric(
+                        "trial_value",
+                        float(t.value),
+                        int(t.datetime_complete.timestamp() * 1000),
+                        t.number,
+                    )
+                    for t in study.trials
+                    if t.value is not None
+                ],
+            )
+        
         # Update model config with best parameters
-        self.model_config.update(best_params)
+        self.model_config = self._with_params(best_params)
         
         return best_params
     
+    def _with_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge tuned hyperparameters into a copy of the model configuration.
+        
+        For neural networks, optimizer hyperparameters go into the nested
+        "optimizer" config, which the model factory keeps out of the
+        architecture it caches.
+        
+        Args:
+            params: Hyperparameter values
+            
+        Returns:
+            Updated model configuration
+        """
+        params = dict(params)
+        model_config = dict(self.model_config)
+        if self.is_neural_network:
+            optimizer_config = dict(model_config.get("optimizer", {"type": "adam", "learning_rate": 0.001}))
+            for param_name, key in _OPTIMIZER_PARAMS.items():
+                if param_name in params:
+                    optimizer_config[key] = params.pop(param_name)
+            model_config["optimizer"] = optimizer_config
+        
+        model_config.update(params)
+        return model_config
+    
     def save_model_config(self, config_path: str) -> None:
         """
         Save the model configuration to a file.
@@ -498,7 +772,9 @@ class ModelTrainer:
             # Load the model from MLflow
             logged_model = f"runs:/{trainer.run_id}/model"
             if trainer.is_neural_network:
-                trainer.model = mlflow.tensorflow.load_model(logged_model)
+                import mlflow.tensorflow as mlflow_tensorflow
+                
+                trainer.model = mlflow_tensorflow.load_model(logged_model)
             else:
                 trainer.model = mlflow.sklearn.load_model(logged_model)
         